@@ -4,10 +4,12 @@ Loads API keys from environment variables.
 """
 
 import os
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+# Load environment variables from .env file, unless they are already set
+# (e.g. in CI or containers) so python-dotenv isn't imported at all
+if not all(os.getenv(key) for key in ("SEC_API_KEY", "PERPLEXITY_API_KEY", "CLAY_WEBHOOK_URL")):
+    from dotenv import load_dotenv
+    load_dotenv()
 
 # API Keys (set via environment variables or .env file)
 SEC_API_KEY = os.getenv("SEC_API_KEY", "")
@@ -18,9 +20,34 @@ CLAY_WEBHOOK_URL = os.getenv("CLAY_WEBHOOK_URL", "")
 SEC_FORM_D_ENDPOINT = "https://api.sec-api.io/form-d"
 PERPLEXITY_API_ENDPOINT = "https://api.perplexity.ai/chat/completions"
 
-# Rate Limiting (seconds between requests)
-SEC_API_DELAY = 0.5  # 2 requests/second (conservative to avoid rate limiting)
-PERPLEXITY_API_DELAY = 1.0  # 1 request/second
+# Website enrichment: concurrent Perplexity lookups
+PERPLEXITY_ENRICH_CONCURRENCY = 16  # website lookups in flight at once
+PERPLEXITY_ENRICH_BATCH_SIZE = 10  # companies asked about per request
+WEBSITE_GUESS_ENABLED = False  # try www.<name>.com/.ai/.io before asking Perplexity; generic names can hit unrelated sites
+WEBSITE_VERIFY_ENABLED = False  # HEAD-check Perplexity's URLs; off as bot-protected sites may refuse HEAD
+
+# Perplexity token bucket (website enrichment): sustained requests/second and burst size
+PERPLEXITY_ENRICH_RATE_PER_SEC = 5.0
+PERPLEXITY_ENRICH_RATE_BURST = 5
+
+# Persistent cache of found websites, reused across runs
+WEBSITE_CACHE_PATH = "website_cache.db"
+WEBSITE_CACHE_TTL = 30 * 24 * 60 * 60  # seconds; entries older than this are looked up again
+WEBSITE_CACHE_MATCH_THRESHOLD = 95  # min similarity (0-100) to reuse a near-identical name's website
+
+# Perplexity token bucket (news sources): sustained requests/second and burst size
+PERPLEXITY_RATE_PER_SEC = 1.0
+PERPLEXITY_RATE_BURST = 1
+PERPLEXITY_MAX_CONNECTIONS = 8  # pooled keep-alive connections per session
+
+# Ask for all news sources in one Perplexity request (falls back to one per source)
+PERPLEXITY_BATCH_NEWS_SOURCES = True
+
+# SEC API token bucket (requests/second, shared by all page workers)
+SEC_API_RATE_PER_SEC = 10  # sec-api.io caps clients at 10 requests/second
+# Pages fetched in parallel. One worker per token per second keeps the limiter,
+# not request latency, as the bottleneck, so pages go out at the full cap.
+SEC_API_CONCURRENCY = SEC_API_RATE_PER_SEC
 
 # Pagination
 SEC_API_PAGE_SIZE = 50  # Max allowed by SEC API
@@ -30,8 +57,12 @@ LOOKBACK_DAYS = 30
 
 # Clay webhook batch size (1 = send one company at a time)
 CLAY_BATCH_SIZE = 1
+CLAY_CONCURRENCY = 4  # sends in flight at once
+CLAY_RATE_PER_SEC = 5 * CLAY_CONCURRENCY  # 200ms spacing per worker
 
 # Retry settings
 MAX_RETRIES = 3
-RETRY_DELAY = 2  # seconds, will be multiplied by attempt number
+RETRY_DELAY = 2  # seconds, urllib3 backoff_factor for SEC/Clay retries
+BASE_DELAY = 1.0  # seconds, first step of exponential backoff (Perplexity)
+MAX_DELAY = 30.0  # seconds, upper bound for a single backoff sleep
 
@@ -15,6 +15,8 @@ Then deduplicates, enriches with website data, and sends to Clay webhook.
 
 import sys
 import argparse
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Import source modules
@@ -73,25 +75,30 @@ def main(
     sec_companies = []
     news_companies = []
     
-    # Fetch from SEC Form D
-    if not skip_sec:
-        try:
-            sec_companies = fetch_sec_form_d_filings()
-        except Exception as e:
-            print(f"\nError fetching SEC Form D filings: {e}")
-            print("Continuing with news sources...")
-    else:
-        print("\n  Skipping SEC Form D fetching...")
-    
-    # Fetch from news sources via Perplexity
-    if not skip_news:
-        try:
-            news_companies = fetch_funding_news_from_all_sources()
-        except Exception as e:
-            print(f"\nError fetching news sources: {e}")
-            print("Continuing with SEC data only...")
-    else:
-        print("\n  Skipping news source fetching...")
+    # Fetch from SEC Form D and news sources concurrently (different APIs)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        sec_future = executor.submit(fetch_sec_form_d_filings) if not skip_sec else None
+        news_future = executor.submit(fetch_funding_news_from_all_sources) if not skip_news else None
+        
+        # Fetch from SEC Form D
+        if sec_future is not None:
+            try:
+                sec_companies = sec_future.result()
+            except Exception as e:
+                print(f"\nError fetching SEC Form D filings: {e}")
+                print("Continuing with news sources...")
+        else:
+            print("\n  Skipping SEC Form D fetching...")
+        
+        # Fetch from news sources via Perplexity
+        if news_future is not None:
+            try:
+                news_companies = news_future.result()
+            except Exception as e:
+                print(f"\nError fetching news sources: {e}")
+                print("Continuing with SEC data only...")
+        else:
+            print("\n  Skipping news source fetching...")
     
     # Combine all companies
     all_companies = sec_companies + news_companies
@@ -124,7 +131,7 @@ def main(
         print("\n  Skipping website enrichment...")
     
     # Count companies with websites
-    with_websites = sum(1 for c in deduped_companies if c.get("company_website"))
+    with_websites = sum(1 for c in deduped_companies if c.company_website)
     print(f"\nCompanies with websites: {with_websites}/{len(deduped_companies)}")
     
     # Send to Clay
@@ -135,12 +142,12 @@ def main(
         # Show sample of what would be sent
         print("\n  Sample companies:")
         for company in deduped_companies[:5]:
-            print(f"    - {company['company_name']}")
-            if company.get('company_website'):
-                print(f"      Website: {company['company_website']}")
-            if company.get('funding_amount'):
-                print(f"      Funding: ${company['funding_amount']:,}")
-            print(f"      Source: {company.get('source', company.get('sources', 'Unknown'))}")
+            print(f"    - {company.company_name}")
+            if company.company_website:
+                print(f"      Website: {company.company_website}")
+            if company.funding_amount:
+                print(f"      Funding: ${company.funding_amount:,}")
+            print(f"      Source: {company.source or company.sources or 'Unknown'}")
         
         successful, failed = len(deduped_companies), 0
     else:
@@ -205,8 +212,18 @@ if __name__ == "__main__":
         help="Only test the Clay webhook connection and exit"
     )
     
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Show per-company website lookup results"
+    )
+    
     args = parser.parse_args()
     
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if args.verbose:
+        logging.getLogger("utils.enrichment").setLevel(logging.DEBUG)
+    
     main(
         skip_sec=args.skip_sec,
         skip_news=args.skip_news,
@@ -2,8 +2,8 @@
 Data source modules for fetching funded company information.
 """
 
-from .sec_api import fetch_sec_form_d_filings
+from .sec_api import fetch_sec_form_d_filings, iter_sec_form_d_filings
 from .perplexity_news import fetch_funding_news_from_all_sources
 
-__all__ = ["fetch_sec_form_d_filings", "fetch_funding_news_from_all_sources"]
+__all__ = ["fetch_sec_form_d_filings", "iter_sec_form_d_filings", "fetch_funding_news_from_all_sources"]
 
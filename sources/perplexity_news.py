@@ -3,142 +3,133 @@ Perplexity AI-based news scraper for funding announcements.
 Searches TechCrunch, VentureBeat, CB Insights, PitchBook, and Founder Collective.
 """
 
-import requests
-import time
+import asyncio
+import aiohttp
 import json
 import re
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import List, Dict, Any, Optional
 
 import config
+from sources.types import Company
+from utils import deduplication, json_codec
+from utils.http_client import AsyncTokenBucket, CircuitBreaker, backoff_delay, parse_retry_after, run_sync
+
+
+# Patterns used when parsing responses (compiled once at import)
+_FENCE_LEAD_RE = re.compile(r'(?:`{1,3}[a-zA-Z]*)?')
+_NAME_KEY_RE = re.compile(r'\b(?:inc|ltd|llc|corp)\b|[^\w\s]')
+# Longer suffixes come first in the alternation so "million" wins over "m";
+# the unit of a range ("10-15M", "10 to 15 million") applies to its low end
+_AMOUNT_RE = re.compile(
+    r'(\d+(?:\.\d+)?)(?:\s*(?:-|–|to)\s*\$?\d+(?:\.\d+)?)?\s*(thousand|million|billion|mm|k|m|b)?',
+    re.IGNORECASE
+)
+_AMOUNT_MULTIPLIERS = {
+    "": 1,
+    "k": 1_000,
+    "thousand": 1_000,
+    "m": 1_000_000,
+    "million": 1_000_000,
+    "mm": 1_000_000,
+    "b": 1_000_000_000,
+    "billion": 1_000_000_000
+}
 
+# Config values read on every request, bound once
+_ENDPOINT = config.PERPLEXITY_API_ENDPOINT
+_MAX_RETRIES = config.MAX_RETRIES
 
-# Prompts for each news source
-NEWS_SOURCE_PROMPTS = {
-    "TechCrunch": """Search TechCrunch for US-based startup funding announcements from the last 30 days.
-List each company that raised funding with:
-- Company name
-- Funding amount (in USD)
-- Funding round (Seed, Series A, B, C, etc.)
-- Lead investors
-- Company industry/sector
-- Brief company description
-- Headquarters location
-
-Return ONLY a valid JSON array with objects containing these exact fields:
-{
-  "company_name": "string",
-  "funding_amount": number or null,
-  "funding_round": "string",
-  "investors": ["array of investor names"],
-  "industry": "string",
-  "description": "string",
-  "location": "string"
-}
+# Circuit breaker: after 3 requests fail outright, skip Perplexity calls
+# for 60 seconds instead of retrying a dead endpoint
+_breaker = CircuitBreaker("Perplexity", threshold=3, cooldown=60)
 
-Include at least 10-15 companies if available. Return ONLY the JSON array, no other text.""",
-
-    "VentureBeat": """Search VentureBeat for venture capital and startup funding announcements from the last 30 days for US-based companies.
-List each company that announced funding with:
-- Company name
-- Funding amount (in USD)
-- Funding round type
-- Investors
-- Industry/sector
-- Brief description
-- Location
-
-Return ONLY a valid JSON array with objects containing these exact fields:
-{
-  "company_name": "string",
-  "funding_amount": number or null,
-  "funding_round": "string",
-  "investors": ["array of investor names"],
-  "industry": "string",
-  "description": "string",
-  "location": "string"
+# Static parts of every request, built once
+_SYSTEM_MSG = {
+    "role": "system",
+    "content": "You are a financial research assistant that finds and reports on startup funding announcements. Always return data in valid JSON format."
 }
-
-Include at least 10-15 companies if available. Return ONLY the JSON array, no other text.""",
-
-    "CB Insights": """Search CB Insights for recent startup funding rounds and deals from the last 30 days for US-based companies.
-List companies that received funding with:
-- Company name
-- Funding amount
-- Round type (Seed, Series A, B, etc.)
-- Investors
-- Industry
-- Description
-- Location
-
-Return ONLY a valid JSON array with objects containing these exact fields:
-{
-  "company_name": "string",
-  "funding_amount": number or null,
-  "funding_round": "string",
-  "investors": ["array of investor names"],
-  "industry": "string",
-  "description": "string",
-  "location": "string"
+_headers: Optional[Dict[str, str]] = None
+
+# Shared by all concurrent source requests in this process
+_rate_limiter = AsyncTokenBucket(config.PERPLEXITY_RATE_PER_SEC, config.PERPLEXITY_RATE_BURST)
+
+# Output schema and closing instruction shared by every source prompt
+_SCHEMA = """{"company_name": "string", "funding_amount": number or null, "funding_round": "string", "investors": ["investor names"], "industry": "string", "description": "string", "location": "string"}"""
+
+_TAIL = "Include at least {count} companies if available. Return ONLY the JSON array, no other text."
+
+# Per-source search instruction and minimum number of companies to ask for
+_PREAMBLES = {
+    "TechCrunch": (
+        "Search TechCrunch for US-based startup funding announcements from the last 30 days.",
+        "10-15"
+    ),
+    "VentureBeat": (
+        "Search VentureBeat for venture capital and startup funding announcements from the last 30 days for US-based companies.",
+        "10-15"
+    ),
+    "CB Insights": (
+        "Search CB Insights for recent startup funding rounds and deals from the last 30 days for US-based companies.",
+        "10-15"
+    ),
+    "PitchBook": (
+        "Search PitchBook and related news for recent private equity and venture capital deals from the last 30 days involving US-based companies.",
+        "10-15"
+    ),
+    "Founder Collective Portfolio": (
+        "Search for recent funding announcements from Founder Collective portfolio companies and other notable early-stage startups from the last 30 days. "
+        "Focus on US-based companies that announced funding rounds.",
+        "5-10"
+    ),
 }
 
-Include at least 10-15 companies if available. Return ONLY the JSON array, no other text.""",
-
-    "PitchBook": """Search PitchBook and related news for recent private equity and venture capital deals from the last 30 days involving US-based companies.
-List companies that raised funding with:
-- Company name
-- Deal size/funding amount
-- Round type
-- Investors
-- Sector/Industry
-- Description
-- Location
-
-Return ONLY a valid JSON array with objects containing these exact fields:
-{
-  "company_name": "string",
-  "funding_amount": number or null,
-  "funding_round": "string",
-  "investors": ["array of investor names"],
-  "industry": "string",
-  "description": "string",
-  "location": "string"
+# Prompts for each news source
+NEWS_SOURCE_PROMPTS = {
+    name: (
+        f"{preamble}\n\n"
+        f"Return a JSON array with one object per funded company, using these exact fields "
+        f"(funding_amount in USD, funding_round such as Seed or Series A):\n{_SCHEMA}\n\n"
+        f"{_TAIL.format(count=count)}"
+    )
+    for name, (preamble, count) in _PREAMBLES.items()
 }
 
-Include at least 10-15 companies if available. Return ONLY the JSON array, no other text.""",
-
-    "Founder Collective Portfolio": """Search for recent funding announcements from Founder Collective portfolio companies and other notable early-stage startups from the last 30 days.
-Focus on US-based companies that announced funding rounds.
-List companies with:
-- Company name
-- Funding amount
-- Round type
-- Investors
-- Industry
-- Description
-- Location
-
-Return ONLY a valid JSON array with objects containing these exact fields:
-{
-  "company_name": "string",
-  "funding_amount": number or null,
-  "funding_round": "string",
-  "investors": ["array of investor names"],
-  "industry": "string",
-  "description": "string",
-  "location": "string"
-}
+# Single prompt covering every source at once, answered as {source: [companies]}
+BATCHED_NEWS_PROMPT = (
+    "Research recent funding announcements for each of the following sources:\n"
+    + "\n".join(
+        f'- "{name}": {preamble} (at least {count} companies if available)'
+        for name, (preamble, count) in _PREAMBLES.items()
+    )
+    + "\n\nDescribe each funded company as an object with these exact fields "
+    + f"(funding_amount in USD, funding_round such as Seed or Series A):\n{_SCHEMA}\n\n"
+    + "Return ONLY a valid JSON object keyed by the source names above, each mapping to an "
+    + 'array of companies, e.g. {"TechCrunch": [...], "VentureBeat": [...]}. No other text.'
+)
 
-Include at least 5-10 companies if available. Return ONLY the JSON array, no other text."""
-}
+# The combined answer is roughly five answers long
+_BATCHED_MAX_TOKENS = 8000
 
 
-def fetch_funding_news_from_all_sources() -> List[Dict[str, Any]]:
+def fetch_funding_news_from_all_sources() -> List[Company]:
     """
     Fetch funding news from all configured news sources using Perplexity AI.
+    Synchronous wrapper around fetch_funding_news_from_all_sources_async().
+    
+    Returns:
+        List of normalized Company records from all sources.
+    """
+    return run_sync(fetch_funding_news_from_all_sources_async())
+
+
+async def fetch_funding_news_from_all_sources_async() -> List[Company]:
+    """
+    Fetch funding news from all configured news sources concurrently.
+    All source prompts share one HTTP session and are in flight at the same time.
     
     Returns:
-        List of normalized company dictionaries from all sources.
+        List of normalized Company records from all sources.
     """
     print(f"\n{'='*60}")
     print("Fetching funding news via Perplexity AI...")
@@ -146,87 +137,311 @@ def fetch_funding_news_from_all_sources() -> List[Dict[str, Any]]:
     
     all_companies = []
     
-    for source_name, prompt in NEWS_SOURCE_PROMPTS.items():
-        print(f"\n  Searching {source_name}...")
+    # Same for every company found in this run
+    announcement_date = datetime.now().strftime("%Y-%m-%d")
+    
+    # Keep-alive pool so retries and sources reuse TCP/TLS connections
+    connector = aiohttp.TCPConnector(limit=config.PERPLEXITY_MAX_CONNECTIONS, keepalive_timeout=30)
+    
+    async with aiohttp.ClientSession(connector=connector) as session:
+        results = None
         
-        companies = _fetch_from_source(source_name, prompt)
+        if config.PERPLEXITY_BATCH_NEWS_SOURCES:
+            results = await _fetch_all_sources_batched(session, announcement_date)
+            if results is None:
+                print("    Batched response unusable, falling back to one request per source")
         
-        if companies:
-            print(f"    Found {len(companies)} companies from {source_name}")
-            all_companies.extend(companies)
+        if results is None:
+            tasks = [
+                asyncio.create_task(_fetch_from_source_async(source_name, prompt, session, announcement_date))
+                for source_name, prompt in NEWS_SOURCE_PROMPTS.items()
+            ]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+    
+    # Sources overlap heavily, so exact name repeats are merged here (their
+    # investors and details fill gaps in the earlier record); fuzzy matching
+    # is left to deduplicate_companies
+    seen: Dict[str, int] = {}
+    
+    for source_name, companies in zip(NEWS_SOURCE_PROMPTS, results):
+        if isinstance(companies, Exception):
+            print(f"\n  Error searching {source_name}: {companies}")
+        elif companies:
+            repeats = 0
+            for company in companies:
+                key = _name_key(company.company_name)
+                if key in seen:
+                    index = seen[key]
+                    all_companies[index] = deduplication.merge_company_group([all_companies[index], company])
+                    repeats += 1
+                    continue
+                seen[key] = len(all_companies)
+                all_companies.append(company)
+            print(f"\n  Found {len(companies)} companies from {source_name} ({repeats} already seen)")
         else:
-            print(f"    No companies found from {source_name}")
-        
-        # Rate limiting between requests
-        time.sleep(config.PERPLEXITY_API_DELAY)
+            print(f"\n  No companies found from {source_name}")
     
     print(f"\n  Total companies from news sources: {len(all_companies)}")
     return all_companies
 
 
-def _fetch_from_source(source_name: str, prompt: str) -> List[Dict[str, Any]]:
+async def _fetch_from_source_async(
+    source_name: str,
+    prompt: str,
+    session: aiohttp.ClientSession,
+    announcement_date: str
+) -> List[Company]:
     """
     Fetch funding news from a single source using Perplexity AI.
     """
-    response = _make_perplexity_request(prompt)
+    print(f"\n  Searching {source_name}...")
+    
+    response = await _make_perplexity_request(prompt, session)
     
     if response is None:
         return []
     
     # Parse the response
-    companies = _parse_perplexity_response(response, source_name)
+    companies = _parse_perplexity_response(response, source_name, announcement_date)
     
     return companies
 
 
-def _make_perplexity_request(prompt: str) -> Optional[str]:
+async def _fetch_all_sources_batched(
+    session: aiohttp.ClientSession,
+    announcement_date: str
+) -> Optional[List[List[Company]]]:
+    """
+    Fetch funding news for every source with a single Perplexity request.
+    
+    Returns:
+        Companies per source, in NEWS_SOURCE_PROMPTS order, or None if the
+        answer was not a JSON object keyed by source (e.g. truncated at
+        max_tokens). If the request itself failed, every source comes back
+        empty: Perplexity is unreachable, so five more requests (each with
+        its own retries) would only prolong the outage.
+    """
+    print(f"\n  Searching all {len(NEWS_SOURCE_PROMPTS)} sources in one request...")
+    
+    response = await _make_perplexity_request(BATCHED_NEWS_PROMPT, session, max_tokens=_BATCHED_MAX_TOKENS)
+    
+    if response is None:
+        print("    Batched request failed, skipping per-source requests")
+        return [[] for _ in NEWS_SOURCE_PROMPTS]
+    
+    data = json_codec.extract_json(response)
+    
+    if not isinstance(data, dict) or not any(name in data for name in NEWS_SOURCE_PROMPTS):
+        return None
+    
+    results = []
+    for source_name in NEWS_SOURCE_PROMPTS:
+        items = data.get(source_name)
+        companies = []
+        if isinstance(items, list):
+            for item in items:
+                if isinstance(item, dict):
+                    company = _normalize_news_company(item, source_name, announcement_date)
+                    if company:
+                        companies.append(company)
+        results.append(companies)
+    
+    return results
+
+
+async def _make_perplexity_request(
+    prompt: str,
+    session: aiohttp.ClientSession,
+    max_tokens: int = 4000
+) -> Optional[str]:
     """
     Make a request to Perplexity AI API with retry logic.
+    Returns None immediately while the circuit breaker is open.
     """
-    headers = {
-        "Authorization": f"Bearer {config.PERPLEXITY_API_KEY}",
-        "Content-Type": "application/json"
-    }
+    if not _breaker.allow_request():
+        return None
     
     payload = {
         "model": "sonar",
-        "messages": [
-            {
-                "role": "system",
-                "content": "You are a financial research assistant that finds and reports on startup funding announcements. Always return data in valid JSON format."
-            },
-            {
-                "role": "user",
-                "content": prompt
-            }
-        ],
+        "messages": [_SYSTEM_MSG, {"role": "user", "content": prompt}],
         "temperature": 0.1,
-        "max_tokens": 4000
+        "max_tokens": max_tokens,
+        "stream": True
     }
+    body = json_codec.dumps(payload)
+    headers = _get_headers()
     
-    for attempt in range(1, config.MAX_RETRIES + 1):
+    for attempt in range(1, _MAX_RETRIES + 1):
+        retry_after = None
+        
         try:
-            response = requests.post(
-                config.PERPLEXITY_API_ENDPOINT,
-                json=payload,
+            await _rate_limiter.acquire()
+            async with session.post(
+                _ENDPOINT,
+                data=body,
                 headers=headers,
-                timeout=60
-            )
-            response.raise_for_status()
-            
-            result = response.json()
-            content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
-            return content
+                # Streamed: bound the gap between chunks rather than only the total
+                timeout=aiohttp.ClientTimeout(total=180, sock_read=60)
+            ) as response:
+                if response.status == 429 or response.status >= 500:
+                    # Rate limited or server error: worth retrying
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    print(f"    Attempt {attempt}/{_MAX_RETRIES} failed: HTTP {response.status}")
+                elif response.status >= 400:
+                    # Other client errors won't succeed on retry
+                    print(f"    Request failed: HTTP {response.status} (not retrying)")
+                    break
+                elif response.content_type == "text/event-stream":
+                    content = await _read_streamed_content(response)
+                    _breaker.record_success()
+                    return content
+                else:
+                    result = await response.json(loads=json_codec.loads)
+                    content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
+                    _breaker.record_success()
+                    return content
             
-        except requests.exceptions.RequestException as e:
-            print(f"    Attempt {attempt}/{config.MAX_RETRIES} failed: {e}")
-            if attempt < config.MAX_RETRIES:
-                time.sleep(config.RETRY_DELAY * attempt)
+        except (
+            aiohttp.ClientConnectionError,
+            aiohttp.ClientPayloadError,
+            aiohttp.ContentTypeError,
+            json_codec.JSONDecodeError,
+            asyncio.TimeoutError
+        ) as e:
+            # Undecodable 200 responses count as a failed attempt too
+            print(f"    Attempt {attempt}/{_MAX_RETRIES} failed: {e!r}")
+        
+        if attempt < _MAX_RETRIES:
+            await asyncio.sleep(backoff_delay(attempt, retry_after))
     
+    _breaker.record_failure()
     return None
 
 
-def _parse_perplexity_response(response: str, source_name: str) -> List[Dict[str, Any]]:
+async def _read_streamed_content(response: aiohttp.ClientResponse) -> str:
+    """
+    Collect the assistant message from a server-sent event stream.
+    Stops reading as soon as the streamed JSON document is complete and
+    returns just that document.
+    """
+    parts = []
+    detector = _JsonCompletionDetector()
+    
+    async for raw_line in response.content:
+        line = raw_line.strip()
+        if not line.startswith(b"data:"):
+            continue
+        
+        data = line[5:].strip()
+        if data == b"[DONE]":
+            break
+        
+        chunk = json_codec.loads(data)
+        delta = (chunk.get("choices") or [{}])[0].get("delta", {}).get("content") or ""
+        if not delta:
+            continue
+        
+        parts.append(delta)
+        end = detector.feed(delta)
+        if end is not None:
+            # Anything after the closing bracket is prose/citations we don't use
+            response.close()
+            return "".join(parts)[detector.start:end]
+    
+    return "".join(parts)
+
+
+class _JsonCompletionDetector:
+    """
+    Tracks streamed text and reports when the top-level JSON array/object
+    has been closed. Only engages when the answer starts with JSON
+    (optionally inside a ``` fence), so bracketed prose like "[1]" before
+    the data can't end the stream early.
+    """
+    
+    def __init__(self):
+        self.lead = ""
+        self.active = None  # None until we know whether the answer starts with JSON
+        self.start = 0  # offset of the opening bracket in the streamed text
+        self.fed = 0  # length of the streamed text seen so far
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+    
+    def feed(self, chunk: str) -> Optional[int]:
+        """
+        Consume the next piece of streamed text. Returns the offset in the
+        whole streamed text just past the closing bracket once the JSON
+        document is complete, otherwise None.
+        """
+        offset = self.fed
+        self.fed += len(chunk)
+        
+        if self.active is False:
+            return None
+        
+        if self.active is None:
+            self.lead += chunk
+            starts = [i for i in (self.lead.find("["), self.lead.find("{")) if i != -1]
+            if not starts:
+                if not _FENCE_LEAD_RE.fullmatch(self.lead.strip()):
+                    self.active = False
+                return None
+            
+            begin = min(starts)
+            self.active = bool(_FENCE_LEAD_RE.fullmatch(self.lead[:begin].strip()))
+            if not self.active:
+                return None
+            # The lead holds the whole stream so far, so offsets line up with it
+            self.start = offset = begin
+            chunk = self.lead[begin:]
+        
+        for i, ch in enumerate(chunk):
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch in "[{":
+                self.depth += 1
+            elif ch in "]}":
+                self.depth -= 1
+                if self.depth == 0:
+                    return offset + i + 1
+        
+        return None
+
+
+def _name_key(name: str) -> str:
+    """
+    Cheap exact-match key for a company name: lowercase, no legal suffix or punctuation.
+    """
+    return " ".join(_NAME_KEY_RE.sub("", name.lower()).split())
+
+
+def _get_headers() -> Dict[str, str]:
+    """
+    Build the request headers on first use and reuse them afterwards.
+    Deferred so the API key is read after the environment is loaded.
+    """
+    global _headers
+    if _headers is None:
+        _headers = {
+            "Authorization": f"Bearer {config.PERPLEXITY_API_KEY}",
+            "Content-Type": "application/json"
+        }
+    return _headers
+
+
+def _parse_perplexity_response(
+    response: str,
+    source_name: str,
+    announcement_date: str
+) -> List[Company]:
     """
     Parse Perplexity AI response and extract company data.
     """
@@ -234,14 +449,12 @@ def _parse_perplexity_response(response: str, source_name: str) -> List[Dict[str
     
     try:
         # Try to extract JSON from the response
-        json_str = _extract_json_from_text(response)
+        data = json_codec.extract_json(response)
         
-        if not json_str:
+        if data is None:
             print(f"    Could not extract JSON from response")
             return []
         
-        data = json.loads(json_str)
-        
         # Handle both array and object with array property
         if isinstance(data, dict):
             # Look for an array property
@@ -250,7 +463,10 @@ def _parse_perplexity_response(response: str, source_name: str) -> List[Dict[str
                     data = data[key]
                     break
             else:
-                # If still a dict, wrap in list
+                # Only a dict that is itself a company record is worth normalizing
+                if "company_name" not in data:
+                    print(f"    Response object has no company list (keys: {', '.join(list(data)[:5])})")
+                    return []
                 data = [data]
         
         if not isinstance(data, list):
@@ -260,66 +476,24 @@ def _parse_perplexity_response(response: str, source_name: str) -> List[Dict[str
         # Normalize each company
         for item in data:
             if isinstance(item, dict):
-                company = _normalize_news_company(item, source_name)
+                company = _normalize_news_company(item, source_name, announcement_date)
                 if company:
                     companies.append(company)
         
-    except json.JSONDecodeError as e:
-        print(f"    JSON parse error: {e}")
     except Exception as e:
         print(f"    Error parsing response: {e}")
     
     return companies
 
 
-def _extract_json_from_text(text: str) -> Optional[str]:
-    """
-    Extract JSON array or object from text that may contain other content.
-    """
-    # First, try to parse the entire text as JSON
-    text = text.strip()
-    
-    # Remove markdown code blocks if present
-    if text.startswith("```"):
-        lines = text.split("\n")
-        # Remove first line (```json or ```) and last line (```)
-        if lines[0].startswith("```"):
-            lines = lines[1:]
-        if lines and lines[-1].strip() == "```":
-            lines = lines[:-1]
-        text = "\n".join(lines)
-    
-    # Try direct parse
-    try:
-        json.loads(text)
-        return text
-    except json.JSONDecodeError:
-        pass
-    
-    # Try to find JSON array
-    array_match = re.search(r'\[[\s\S]*\]', text)
-    if array_match:
-        try:
-            json.loads(array_match.group())
-            return array_match.group()
-        except json.JSONDecodeError:
-            pass
-    
-    # Try to find JSON object
-    object_match = re.search(r'\{[\s\S]*\}', text)
-    if object_match:
-        try:
-            json.loads(object_match.group())
-            return object_match.group()
-        except json.JSONDecodeError:
-            pass
-    
-    return None
-
-
-def _normalize_news_company(item: Dict[str, Any], source_name: str) -> Optional[Dict[str, Any]]:
+def _normalize_news_company(
+    item: Dict[str, Any],
+    source_name: str,
+    announcement_date: str
+) -> Optional[Company]:
     """
     Normalize a company from news source into our standard format.
+    `announcement_date` is the run date (YYYY-MM-DD), computed once per run.
     """
     try:
         company_name = item.get("company_name", "").strip()
@@ -337,27 +511,21 @@ def _normalize_news_company(item: Dict[str, Any], source_name: str) -> Optional[
         if isinstance(investors, str):
             # Split comma-separated string
             investors = [inv.strip() for inv in investors.split(",") if inv.strip()]
+        if not isinstance(investors, list):
+            investors = []
         
-        return {
-            "company_name": company_name,
-            "company_website": None,  # Will be enriched later
-            "funding_amount": funding_amount,
-            "amount_sold": None,
-            "funding_round": item.get("funding_round", "Unknown"),
-            "investors": investors if isinstance(investors, list) else [],
-            "industry": item.get("industry", ""),
-            "location": item.get("location", ""),
-            "founding_year": None,
-            "source": source_name,
-            "announcement_date": datetime.now().strftime("%Y-%m-%d"),
-            "description": item.get("description", ""),
-            "ceo_name": None,
-            "executives": [],
-            "phone": "",
-            "linkedin_url": None,
-            "sec_filing_url": None,
-            "total_investors": len(investors) if isinstance(investors, list) else 0
-        }
+        return Company(
+            company_name=company_name,
+            funding_amount=funding_amount,
+            funding_round=item.get("funding_round", "Unknown"),
+            investors=investors,
+            industry=item.get("industry", ""),
+            location=item.get("location", ""),
+            source=source_name,
+            announcement_date=announcement_date,
+            description=item.get("description", ""),
+            total_investors=len(investors)
+        )
         
     except Exception as e:
         print(f"    Error normalizing company: {e}")
@@ -377,31 +545,14 @@ def _parse_funding_amount(amount_str: str) -> Optional[int]:
     if "undisclosed" in amount_str or "unknown" in amount_str:
         return None
     
-    multipliers = {
-        "k": 1_000,
-        "thousand": 1_000,
-        "m": 1_000_000,
-        "million": 1_000_000,
-        "mm": 1_000_000,
-        "b": 1_000_000_000,
-        "billion": 1_000_000_000
-    }
-    
     try:
-        # Extract numeric part
-        number_match = re.search(r'[\d.]+', amount_str)
-        if not number_match:
+        # Number and optional unit suffix in one pass; no suffix means a full number
+        amount_match = _AMOUNT_RE.search(amount_str)
+        if not amount_match:
             return None
         
-        number = float(number_match.group())
-        
-        # Find multiplier
-        for suffix, mult in multipliers.items():
-            if suffix in amount_str:
-                return int(number * mult)
-        
-        # If no multiplier found, assume it's already a full number
-        return int(number)
+        number = float(amount_match.group(1))
+        return int(number * _AMOUNT_MULTIPLIERS[amount_match.group(2) or ""])
         
     except (ValueError, TypeError):
         return None
@@ -413,5 +564,5 @@ if __name__ == "__main__":
     print(f"\nFetched {len(companies)} companies from news sources")
     if companies:
         print("\nFirst company:")
-        print(json.dumps(companies[0], indent=2, default=str))
+        print(json.dumps(companies[0].to_dict(), indent=2, default=str))
 
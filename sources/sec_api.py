@@ -4,20 +4,57 @@ Fetches recently filed Form D offerings from SEC EDGAR.
 """
 
 import requests
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 
 import config
+from sources.types import Company
+from utils import json_codec
+from utils.http_client import TokenBucket, build_session
 
 
-def fetch_sec_form_d_filings() -> List[Dict[str, Any]]:
+# Paces every SEC API request (retries included) across all worker threads
+_rate_limiter = TokenBucket(config.SEC_API_RATE_PER_SEC)
+
+# One pooled session so concurrent page requests reuse TCP/TLS connections
+_SESSION = build_session(
+    config.SEC_API_CONCURRENCY,
+    headers={"Authorization": config.SEC_API_KEY, "Content-Type": "application/json"},
+    rate_limiter=_rate_limiter
+)
+
+# Security-type flags and their funding round labels, in report order
+_FLAG_LABELS = (
+    ("isEquityType", "Equity"),
+    ("isDebtType", "Debt"),
+    ("isPooledInvestmentFundType", "Pooled Investment Fund"),
+    ("isOptionToAcquireType", "Options"),
+    ("isSecurityToBeAcquiredType", "Security to be Acquired"),
+)
+
+
+def fetch_sec_form_d_filings() -> List[Company]:
     """
     Fetch all Form D filings from the last LOOKBACK_DAYS days.
-    Paginates through all results automatically.
     
     Returns:
-        List of normalized company dictionaries.
+        List of normalized Company records.
+    """
+    all_companies = list(iter_sec_form_d_filings())
+    print(f"  Total companies from SEC Form D: {len(all_companies)}")
+    return all_companies
+
+
+def iter_sec_form_d_filings() -> Iterator[Company]:
+    """
+    Yield Form D filings from the last LOOKBACK_DAYS days as pages arrive.
+    Paginates through all results automatically: the first page reports the
+    total count, then the remaining pages are fetched concurrently and yielded
+    in the API's sort order as soon as every earlier page is in.
+    
+    Yields:
+        Normalized Company records.
     """
     print(f"\n{'='*60}")
     print("Fetching SEC Form D filings...")
@@ -31,84 +68,104 @@ def fetch_sec_form_d_filings() -> List[Dict[str, Any]]:
     # Build Lucene query for date range
     query = f"filedAt:[{start_date_str} TO *]"
     
-    all_companies = []
-    offset = 0
-    total_fetched = 0
+    try:
+        response = _make_sec_api_request(_build_page_payload(query, 0))
+    except Exception as e:
+        print(f"  Error fetching SEC filings: {e}")
+        return
+    
+    if response is None:
+        print("  Failed to fetch from SEC API after retries")
+        return
+    
+    offerings = response.get("offerings", [])
+    total_count = response.get("total", {}).get("value", 0)
+    total_fetched = len(offerings)
+    print(f"  Fetched {total_fetched}/{total_count} filings...")
+    yield from _normalize_offerings(offerings)
+    
+    if not offerings or total_fetched >= total_count:
+        return
     
-    while True:
-        payload = {
-            "query": query,
-            "from": str(offset),
-            "size": str(config.SEC_API_PAGE_SIZE),
-            "sort": [{"filedAt": {"order": "desc"}}]
+    # Remaining pages, buffered by offset until all earlier pages have been yielded
+    offsets = list(range(config.SEC_API_PAGE_SIZE, total_count, config.SEC_API_PAGE_SIZE))
+    pages: Dict[int, List[Company]] = {}
+    next_index = 0
+    
+    with ThreadPoolExecutor(max_workers=config.SEC_API_CONCURRENCY) as executor:
+        futures = {
+            executor.submit(_make_sec_api_request, _build_page_payload(query, offset)): offset
+            for offset in offsets
         }
         
-        try:
-            response = _make_sec_api_request(payload)
-            
-            if response is None:
-                print("  Failed to fetch from SEC API after retries")
-                break
-            
-            offerings = response.get("offerings", [])
-            total_count = response.get("total", {}).get("value", 0)
-            
-            if not offerings:
-                break
-            
-            # Normalize each offering into our standard format
-            for offering in offerings:
-                company = _normalize_sec_offering(offering)
-                if company:
-                    all_companies.append(company)
-            
-            total_fetched += len(offerings)
-            print(f"  Fetched {total_fetched}/{total_count} filings...")
-            
-            # Check if we've fetched all results
-            if total_fetched >= total_count:
-                break
+        for future in as_completed(futures):
+            offset = futures[future]
+            try:
+                response = future.result()
+                if response is None:
+                    print(f"  Failed to fetch SEC filings at offset {offset} after retries")
+            except Exception as e:
+                print(f"  Error fetching SEC filings at offset {offset}: {e}")
+                response = None
             
-            offset += config.SEC_API_PAGE_SIZE
-            time.sleep(config.SEC_API_DELAY)
+            # Failed pages are recorded as empty so later pages are not held back
+            offerings = response.get("offerings", []) if response else []
+            pages[offset] = _normalize_offerings(offerings)
+            if response:
+                total_fetched += len(offerings)
+                print(f"  Fetched {total_fetched}/{total_count} filings...")
             
-        except Exception as e:
-            print(f"  Error fetching SEC filings: {e}")
-            break
-    
-    print(f"  Total companies from SEC Form D: {len(all_companies)}")
-    return all_companies
+            while next_index < len(offsets) and offsets[next_index] in pages:
+                yield from pages.pop(offsets[next_index])
+                next_index += 1
 
 
-def _make_sec_api_request(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+def _build_page_payload(query: str, offset: int) -> Dict[str, Any]:
     """
-    Make a request to the SEC Form D API with retry logic.
+    Build the search payload for one page of results.
     """
-    headers = {
-        "Authorization": config.SEC_API_KEY,
-        "Content-Type": "application/json"
+    return {
+        "query": query,
+        "from": str(offset),
+        "size": str(config.SEC_API_PAGE_SIZE),
+        "sort": [{"filedAt": {"order": "desc"}}]
     }
-    
-    for attempt in range(1, config.MAX_RETRIES + 1):
-        try:
-            response = requests.post(
-                config.SEC_FORM_D_ENDPOINT,
-                json=payload,
-                headers=headers,
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json()
-            
-        except requests.exceptions.RequestException as e:
-            print(f"  Attempt {attempt}/{config.MAX_RETRIES} failed: {e}")
-            if attempt < config.MAX_RETRIES:
-                time.sleep(config.RETRY_DELAY * attempt)
+
+
+def _normalize_offerings(offerings: List[Dict[str, Any]]) -> List[Company]:
+    """
+    Normalize each offering of a page into our standard format.
+    """
+    companies = []
+    for offering in offerings:
+        company = _normalize_sec_offering(offering)
+        if company:
+            companies.append(company)
+    return companies
+
+
+def _make_sec_api_request(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Make a request to the SEC Form D API.
+    Retries and backoff are handled by the session's urllib3 Retry policy.
+    """
+    try:
+        _rate_limiter.acquire()
+        response = _SESSION.post(
+            config.SEC_FORM_D_ENDPOINT,
+            data=json_codec.dumps(payload),
+            timeout=30
+        )
+        response.raise_for_status()
+        return json_codec.loads(response.content)
+        
+    except (requests.exceptions.RequestException, json_codec.JSONDecodeError) as e:
+        print(f"  SEC API request failed: {e}")
     
     return None
 
 
-def _normalize_sec_offering(offering: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+def _normalize_sec_offering(offering: Dict[str, Any]) -> Optional[Company]:
     """
     Normalize a SEC Form D offering into our standard company format.
     """
@@ -123,14 +180,13 @@ def _normalize_sec_offering(offering: Dict[str, Any]) -> Optional[Dict[str, Any]
         
         # Extract address
         address_obj = primary_issuer.get("issuerAddress", {})
-        address_parts = [
-            address_obj.get("street1", ""),
-            address_obj.get("street2", ""),
-            address_obj.get("city", ""),
-            address_obj.get("stateOrCountryDescription", ""),
-            address_obj.get("zipCode", "")
-        ]
-        location = ", ".join(part for part in address_parts if part).strip(", ")
+        location = ", ".join(filter(None, (
+            address_obj.get("street1"),
+            address_obj.get("street2"),
+            address_obj.get("city"),
+            address_obj.get("stateOrCountryDescription"),
+            address_obj.get("zipCode")
+        ))).strip(", ")
         
         # Extract industry
         industry_group = offering_data.get("industryGroup", {})
@@ -176,34 +232,32 @@ def _normalize_sec_offering(offering: Dict[str, Any]) -> Optional[Dict[str, Any]
                 sec_filing_url = f"https://www.sec.gov/cgi-bin/browse-edgar?action=getcompany&CIK={cik}&type=D&dateb=&owner=include&count=40"
         
         # Extract year of incorporation as founding year
-        year_of_inc = primary_issuer.get("yearOfInc", {})
+        year_of_inc = primary_issuer.get("yearOfInc", {}).get("value")
         founding_year = None
-        if year_of_inc.get("value"):
+        if year_of_inc:
             try:
-                founding_year = int(year_of_inc.get("value"))
+                founding_year = int(year_of_inc)
             except (ValueError, TypeError):
                 pass
         
-        return {
-            "company_name": company_name,
-            "company_website": None,  # Will be enriched later
-            "funding_amount": total_offering,
-            "amount_sold": amount_sold,
-            "funding_round": funding_round,
-            "investors": [],  # SEC filings don't typically include investor names
-            "industry": industry,
-            "location": location,
-            "founding_year": founding_year,
-            "source": "SEC Form D",
-            "announcement_date": offering.get("filedAt", "")[:10],  # Just the date part
-            "description": f"{primary_issuer.get('entityType', '')} incorporated in {primary_issuer.get('jurisdictionOfInc', '')}",
-            "ceo_name": executives[0] if executives else None,
-            "executives": executives,
-            "phone": primary_issuer.get("issuerPhoneNumber", ""),
-            "linkedin_url": None,
-            "sec_filing_url": sec_filing_url,
-            "total_investors": total_investors
-        }
+        return Company(
+            company_name=company_name,
+            funding_amount=total_offering,
+            amount_sold=amount_sold,
+            funding_round=funding_round,
+            investors=[],  # SEC filings don't typically include investor names
+            industry=industry,
+            location=location,
+            founding_year=founding_year,
+            source="SEC Form D",
+            announcement_date=offering.get("filedAt", "")[:10],  # Just the date part
+            description=f"{primary_issuer.get('entityType', '')} incorporated in {primary_issuer.get('jurisdictionOfInc', '')}",
+            ceo_name=executives[0] if executives else None,
+            executives=executives,
+            phone=primary_issuer.get("issuerPhoneNumber", ""),
+            sec_filing_url=sec_filing_url,
+            total_investors=total_investors
+        )
         
     except Exception as e:
         print(f"  Error normalizing offering: {e}")
@@ -214,21 +268,10 @@ def _determine_funding_round(securities: Dict[str, Any]) -> str:
     """
     Determine the funding round type based on securities offered.
     """
-    types = []
+    types = [label for flag, label in _FLAG_LABELS if securities.get(flag)]
     
-    if securities.get("isEquityType"):
-        types.append("Equity")
-    if securities.get("isDebtType"):
-        types.append("Debt")
-    if securities.get("isPooledInvestmentFundType"):
-        types.append("Pooled Investment Fund")
-    if securities.get("isOptionToAcquireType"):
-        types.append("Options")
-    if securities.get("isSecurityToBeAcquiredType"):
-        types.append("Security to be Acquired")
     if securities.get("isOtherType"):
-        desc = securities.get("descriptionOfOtherType", "Other")
-        types.append(desc if desc else "Other")
+        types.append(securities.get("descriptionOfOtherType") or "Other")
     
     return ", ".join(types) if types else "Unknown"
 
@@ -241,18 +284,19 @@ def _extract_executives(related_persons: List[Dict[str, Any]]) -> List[str]:
     
     for person in related_persons[:5]:  # Limit to first 5
         name_obj = person.get("relatedPersonName", {})
-        first = name_obj.get("firstName", "")
-        middle = name_obj.get("middleName", "")
-        last = name_obj.get("lastName", "")
+        first, middle, last = (
+            name_obj.get("firstName", ""),
+            name_obj.get("middleName", ""),
+            name_obj.get("lastName", "")
+        )
         
-        full_name = " ".join(part for part in [first, middle, last] if part).strip()
+        full_name = " ".join(filter(None, (first, middle, last))).strip()
+        if not full_name:
+            continue
         
         relationships = person.get("relatedPersonRelationshipList", {}).get("relationship", [])
-        if relationships and full_name:
-            title = relationships[0] if relationships else ""
-            executives.append(f"{full_name} - {title}" if title else full_name)
-        elif full_name:
-            executives.append(full_name)
+        title = relationships[0] if relationships else ""
+        executives.append(f"{full_name} - {title}" if title else full_name)
     
     return executives
 
@@ -264,5 +308,5 @@ if __name__ == "__main__":
     if companies:
         print("\nFirst company:")
         import json
-        print(json.dumps(companies[0], indent=2, default=str))
+        print(json.dumps(companies[0].to_dict(), indent=2, default=str))
 
@@ -0,0 +1,38 @@
+"""
+Record types shared by the source, processing and sink modules.
+"""
+
+from dataclasses import dataclass, field, fields
+from typing import List, Dict, Any, Optional
+
+
+@dataclass(slots=True)
+class Company:
+    """
+    Normalized funded-company record produced by every source.
+    """
+    company_name: str
+    company_website: Optional[str] = None  # Will be enriched later
+    funding_amount: Optional[int] = None
+    amount_sold: Optional[int] = None
+    funding_round: str = "Unknown"
+    investors: List[str] = field(default_factory=list)
+    industry: str = ""
+    location: str = ""
+    founding_year: Optional[int] = None
+    source: str = ""
+    announcement_date: str = ""
+    description: str = ""
+    ceo_name: Optional[str] = None
+    executives: List[str] = field(default_factory=list)
+    phone: str = ""
+    linkedin_url: Optional[str] = None
+    sec_filing_url: Optional[str] = None
+    total_investors: int = 0
+    sources: List[str] = field(default_factory=list)  # Filled when duplicates are merged
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Shallow dict view of the record, for JSON output at the boundaries.
+        """
+        return {f.name: getattr(self, f.name) for f in fields(self)}
@@ -4,19 +4,34 @@ Sends company data to Clay via webhook with batching and error handling.
 """
 
 import requests
-import time
-import json
-from typing import List, Dict, Any, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+from typing import List, Dict, Any, Tuple, Iterable, Sized
 
 import config
+from sources.types import Company
+from utils import json_codec
+from utils.http_client import TokenBucket, build_session
 
 
-def send_to_clay(companies: List[Dict[str, Any]]) -> Tuple[int, int]:
+# Paces sends (retries included) across worker threads (replaces the fixed 200ms sleep)
+_rate_limiter = TokenBucket(config.CLAY_RATE_PER_SEC)
+
+# One pooled session shared by all concurrent sends
+_SESSION = build_session(
+    config.CLAY_CONCURRENCY,
+    headers={"Content-Type": "application/json"},
+    rate_limiter=_rate_limiter
+)
+
+
+def send_to_clay(companies: Iterable[Company]) -> Tuple[int, int]:
     """
     Send companies to Clay webhook (one at a time or in batches based on config).
     
     Args:
-        companies: List of company dictionaries to send.
+        companies: Company records to send. Any iterable works, including a
+            generator; batches are sent as soon as they fill.
         
     Returns:
         Tuple of (successful_count, failed_count)
@@ -25,11 +40,14 @@ def send_to_clay(companies: List[Dict[str, Any]]) -> Tuple[int, int]:
     print("Sending companies to Clay webhook...")
     print(f"{'='*60}")
     
-    if not companies:
+    # Totals are only known up front when a sized collection is passed in
+    total = len(companies) if isinstance(companies, Sized) else None
+    if total == 0:
         print("  No companies to send")
         return 0, 0
     
-    print(f"  Total companies to send: {len(companies)}")
+    if total is not None:
+        print(f"  Total companies to send: {total}")
     
     is_single_mode = config.CLAY_BATCH_SIZE == 1
     if is_single_mode:
@@ -37,41 +55,43 @@ def send_to_clay(companies: List[Dict[str, Any]]) -> Tuple[int, int]:
     else:
         print(f"  Batch size: {config.CLAY_BATCH_SIZE}")
     
-    successful = 0
-    failed = 0
+    # Results keyed by batch index: (success, number of companies)
+    results: Dict[int, Tuple[bool, int]] = {}
+    in_flight: Dict[Future, Tuple[int, List[Company]]] = {}
+    total_batches = (total + config.CLAY_BATCH_SIZE - 1) // config.CLAY_BATCH_SIZE if total else "?"
+    iterator = iter(companies)
     
-    # Send in batches (or one at a time if CLAY_BATCH_SIZE == 1)
-    for i in range(0, len(companies), config.CLAY_BATCH_SIZE):
-        batch = companies[i:i + config.CLAY_BATCH_SIZE]
-        current_num = i + 1
-        
-        if is_single_mode:
-            company_name = batch[0].get("company_name", "Unknown")
-            print(f"  [{current_num}/{len(companies)}] Sending: {company_name}")
-        else:
-            batch_num = (i // config.CLAY_BATCH_SIZE) + 1
-            total_batches = (len(companies) + config.CLAY_BATCH_SIZE - 1) // config.CLAY_BATCH_SIZE
-            print(f"  Sending batch {batch_num}/{total_batches} ({len(batch)} companies)...")
-        
-        # Prepare payload for Clay
-        payload = _prepare_clay_payload(batch)
-        
-        success = _send_batch_to_clay(payload)
-        
-        if success:
-            successful += len(batch)
-            if not is_single_mode:
-                print(f"    Sent successfully")
-        else:
-            failed += len(batch)
+    # Send in batches (or one at a time if CLAY_BATCH_SIZE == 1). Payloads are
+    # prepared here while up to CLAY_CONCURRENCY earlier sends are in flight.
+    with ThreadPoolExecutor(max_workers=config.CLAY_CONCURRENCY) as executor:
+        for batch_index, batch in enumerate(iter(lambda: list(islice(iterator, config.CLAY_BATCH_SIZE)), [])):
+            current_num = batch_index * config.CLAY_BATCH_SIZE + 1
+            
             if is_single_mode:
-                print(f"    FAILED")
+                company_name = batch[0].company_name or "Unknown"
+                print(f"  [{current_num}/{total or '?'}] Sending: {company_name}")
             else:
-                print(f"    Batch failed")
+                print(f"  Sending batch {batch_index + 1}/{total_batches} ({len(batch)} companies)...")
+            
+            # Prepare payload for Clay
+            payload = _prepare_clay_payload(batch)
+            
+            future = executor.submit(_send_batch_to_clay, payload)
+            in_flight[future] = (batch_index, batch)
+            
+            if len(in_flight) >= config.CLAY_CONCURRENCY:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                _record_sends(done, in_flight, results, is_single_mode)
         
-        # Small delay between sends
-        if i + config.CLAY_BATCH_SIZE < len(companies):
-            time.sleep(0.2)  # 200ms delay between individual sends
+        done, _ = wait(in_flight)
+        _record_sends(done, in_flight, results, is_single_mode)
+    
+    if not results:
+        print("  No companies to send")
+        return 0, 0
+    
+    successful = sum(count for success, count in results.values() if success)
+    failed = sum(count for success, count in results.values() if not success)
     
     print(f"\n  Summary:")
     print(f"    Successful: {successful}")
@@ -80,40 +100,65 @@ def send_to_clay(companies: List[Dict[str, Any]]) -> Tuple[int, int]:
     return successful, failed
 
 
-def _prepare_clay_payload(companies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def _record_sends(
+    done: Iterable[Future],
+    in_flight: Dict[Future, Tuple[int, List[Company]]],
+    results: Dict[int, Tuple[bool, int]],
+    is_single_mode: bool
+) -> None:
+    """
+    Move finished sends out of `in_flight` and record their outcome by batch index.
+    """
+    for future in done:
+        batch_index, batch = in_flight.pop(future)
+        success = future.result()
+        results[batch_index] = (success, len(batch))
+        
+        if success:
+            if not is_single_mode:
+                print(f"    Batch {batch_index + 1} sent successfully")
+        elif is_single_mode:
+            print(f"    FAILED: {batch[0].company_name}")
+        else:
+            print(f"    Batch {batch_index + 1} failed")
+
+
+def _prepare_clay_payload(companies: List[Company]) -> List[Dict[str, Any]]:
     """
     Prepare company data for Clay webhook.
     Cleans and formats the data according to Clay's expected format.
     """
-    cleaned = []
-    
-    for company in companies:
-        # Build a clean record with only relevant fields
-        record = {
-            "company_name": company.get("company_name", ""),
-            "company_website": company.get("company_website"),
-            "funding_amount": company.get("funding_amount"),
-            "funding_round": company.get("funding_round", ""),
-            "investors": _format_list(company.get("investors", [])),
-            "industry": company.get("industry", ""),
-            "location": company.get("location", ""),
-            "founding_year": company.get("founding_year"),
-            "source": _format_source(company),
-            "announcement_date": company.get("announcement_date", ""),
-            "description": company.get("description", ""),
-            "ceo_name": company.get("ceo_name"),
-            "executives": _format_list(company.get("executives", [])),
-            "phone": company.get("phone", ""),
-            "linkedin_url": company.get("linkedin_url"),
-            "sec_filing_url": company.get("sec_filing_url"),
-        }
-        
-        # Remove None values for cleaner payload
-        record = {k: v for k, v in record.items() if v is not None}
-        
-        cleaned.append(record)
+    return [_prepare_clay_record(company) for company in companies]
+
+
+def _prepare_clay_record(company: Company) -> Dict[str, Any]:
+    """
+    Build a clean record with only relevant fields. None values are left
+    out as the record is built, for a cleaner payload.
+    """
+    record = {}
+    for key, value in (
+        ("company_name", company.company_name),
+        ("company_website", company.company_website),
+        ("funding_amount", company.funding_amount),
+        ("funding_round", company.funding_round),
+        ("investors", _format_list(company.investors)),
+        ("industry", company.industry),
+        ("location", company.location),
+        ("founding_year", company.founding_year),
+        ("source", _format_source(company)),
+        ("announcement_date", company.announcement_date),
+        ("description", company.description),
+        ("ceo_name", company.ceo_name),
+        ("executives", _format_list(company.executives)),
+        ("phone", company.phone),
+        ("linkedin_url", company.linkedin_url),
+        ("sec_filing_url", company.sec_filing_url),
+    ):
+        if value is not None:
+            record[key] = value
     
-    return cleaned
+    return record
 
 
 def _format_list(items: List[str]) -> str:
@@ -125,60 +170,55 @@ def _format_list(items: List[str]) -> str:
     return ", ".join(str(item) for item in items if item)
 
 
-def _format_source(company: Dict[str, Any]) -> str:
+def _format_source(company: Company) -> str:
     """
     Format the source field, handling merged sources.
     """
-    sources = company.get("sources", [])
-    if sources:
-        return ", ".join(sources)
-    return company.get("source", "Unknown")
+    if company.sources:
+        return ", ".join(company.sources)
+    return company.source or "Unknown"
 
 
 def _send_batch_to_clay(payload: List[Dict[str, Any]]) -> bool:
     """
-    Send a batch of companies to Clay webhook with retry logic.
+    Send a batch of companies to Clay webhook.
+    Retries and backoff are handled by the session's urllib3 Retry policy.
     """
-    headers = {
-        "Content-Type": "application/json"
-    }
-    
     # If sending a single company, unwrap from array to send as single object
     data_to_send = payload[0] if len(payload) == 1 else payload
     
-    for attempt in range(1, config.MAX_RETRIES + 1):
-        try:
-            response = requests.post(
-                config.CLAY_WEBHOOK_URL,
-                json=data_to_send,
-                headers=headers,
-                timeout=30
-            )
-            
-            # Clay webhooks typically return 200 or 201 on success
-            if response.status_code in [200, 201, 202]:
-                return True
-            else:
-                print(f"    Attempt {attempt}: HTTP {response.status_code}")
-                if response.text:
-                    print(f"    Response: {response.text[:200]}")
-                    
-        except requests.exceptions.RequestException as e:
-            print(f"    Attempt {attempt}: Error - {e}")
+    # Encoded once; urllib3 retries resend the same bytes
+    body = json_codec.dumps(data_to_send)
+    
+    try:
+        _rate_limiter.acquire()
+        response = _SESSION.post(
+            config.CLAY_WEBHOOK_URL,
+            data=body,
+            timeout=30
+        )
         
-        if attempt < config.MAX_RETRIES:
-            time.sleep(config.RETRY_DELAY * attempt)
+        # Clay webhooks typically return 200 or 201 on success
+        if response.status_code in [200, 201, 202]:
+            return True
+        
+        print(f"    HTTP {response.status_code}")
+        if response.text:
+            print(f"    Response: {response.text[:200]}")
+            
+    except requests.exceptions.RequestException as e:
+        print(f"    Error - {e}")
     
     return False
 
 
-def send_single_to_clay(company: Dict[str, Any]) -> bool:
+def send_single_to_clay(company: Company) -> bool:
     """
     Send a single company to Clay webhook.
     Useful for testing or one-off sends.
     
     Args:
-        company: Company dictionary to send.
+        company: Company record to send.
         
     Returns:
         True if successful, False otherwise.
@@ -206,10 +246,9 @@ def test_clay_webhook() -> bool:
     }]
     
     try:
-        response = requests.post(
+        response = _SESSION.post(
             config.CLAY_WEBHOOK_URL,
-            json=test_payload,
-            headers={"Content-Type": "application/json"},
+            data=json_codec.dumps(test_payload),
             timeout=10
         )
         
@@ -227,37 +266,39 @@ def test_clay_webhook() -> bool:
 
 
 def generate_summary_report(
-    sec_companies: List[Dict[str, Any]],
-    news_companies: List[Dict[str, Any]],
-    deduped_companies: List[Dict[str, Any]],
+    sec_companies: List[Company],
+    news_companies: List[Company],
+    deduped_companies: List[Company],
     successful: int,
     failed: int
 ) -> str:
     """
     Generate a summary report of the scraping run.
     """
-    report = []
-    report.append("\n" + "=" * 60)
-    report.append("SCRAPING RUN SUMMARY")
-    report.append("=" * 60)
-    report.append(f"\nData Sources:")
-    report.append(f"  SEC Form D filings: {len(sec_companies)}")
-    report.append(f"  News sources: {len(news_companies)}")
-    report.append(f"    - TechCrunch")
-    report.append(f"    - VentureBeat")
-    report.append(f"    - CB Insights")
-    report.append(f"    - PitchBook")
-    report.append(f"    - Founder Collective")
-    report.append(f"\nProcessing:")
-    report.append(f"  Total before dedup: {len(sec_companies) + len(news_companies)}")
-    report.append(f"  After deduplication: {len(deduped_companies)}")
-    report.append(f"  Duplicates removed: {len(sec_companies) + len(news_companies) - len(deduped_companies)}")
-    report.append(f"\nClay Webhook:")
-    report.append(f"  Successfully sent: {successful}")
-    report.append(f"  Failed: {failed}")
-    report.append("=" * 60)
+    total_before = len(sec_companies) + len(news_companies)
+    divider = "=" * 60
     
-    return "\n".join(report)
+    return (
+        f"\n{divider}\n"
+        f"SCRAPING RUN SUMMARY\n"
+        f"{divider}\n"
+        f"\nData Sources:\n"
+        f"  SEC Form D filings: {len(sec_companies)}\n"
+        f"  News sources: {len(news_companies)}\n"
+        f"    - TechCrunch\n"
+        f"    - VentureBeat\n"
+        f"    - CB Insights\n"
+        f"    - PitchBook\n"
+        f"    - Founder Collective\n"
+        f"\nProcessing:\n"
+        f"  Total before dedup: {total_before}\n"
+        f"  After deduplication: {len(deduped_companies)}\n"
+        f"  Duplicates removed: {total_before - len(deduped_companies)}\n"
+        f"\nClay Webhook:\n"
+        f"  Successfully sent: {successful}\n"
+        f"  Failed: {failed}\n"
+        f"{divider}"
+    )
 
 
 if __name__ == "__main__":
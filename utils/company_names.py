@@ -0,0 +1,74 @@
+"""
+Company name normalization shared by deduplication and enrichment.
+"""
+
+import re
+from functools import lru_cache
+
+
+# Suffixes to remove when normalizing company names
+COMPANY_SUFFIXES = [
+    r"inc\.?",
+    r"llc\.?",
+    r"ltd\.?",
+    r"corp\.?",
+    r"corporation",
+    r"incorporated",
+    r"limited",
+    r"l\.?l\.?c\.?",
+    r"company",
+    r"co\.?",
+    r"holdings?",
+    r"group",
+    r"partners?",
+    r"ventures?",
+    r"capital",
+    r"fund",
+    r"lp",
+    r"l\.?p\.?",
+]
+
+# Compiled once; the suffix alternation is applied twice to strip stacked suffixes
+_SUFFIX_RE = re.compile(r"\s*,?\s*(?:" + "|".join(COMPANY_SUFFIXES) + r")$", re.IGNORECASE)
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_WS_RE = re.compile(r"\s+")
+
+# company_name_key() drops only legal forms; words like "Capital" or "Group"
+# tell different companies apart ("Sequoia Capital" / "Sequoia Holdings")
+_LEGAL_SUFFIX_RE = re.compile(r"(?:[\s,]+(?:inc|incorporated|llc|l\.l\.c|ltd|limited|corp|corporation|co)\.?)+$")
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]")
+
+
+@lru_cache(maxsize=65536)
+def normalize_company_name(name: str) -> str:
+    """
+    Normalize a company name for comparison.
+    - Lowercase
+    - Remove common suffixes (Inc, LLC, Corp, etc.)
+    - Remove extra whitespace
+    - Remove special characters
+    """
+    if not name:
+        return ""
+    
+    normalized = name.lower().strip()
+    
+    # Remove common suffixes
+    for _ in range(2):
+        normalized = _SUFFIX_RE.sub("", normalized)
+    
+    # Remove special characters but keep spaces
+    normalized = _PUNCT_RE.sub("", normalized)
+    
+    # Normalize whitespace
+    normalized = _WS_RE.sub(" ", normalized).strip()
+    
+    return normalized
+
+
+def company_name_key(company_name: str) -> str:
+    """
+    Lowercase name without legal form, spaces or punctuation, so
+    "OpenAI, Inc." and "Open AI" agree.
+    """
+    return _NON_ALNUM_RE.sub("", _LEGAL_SUFFIX_RE.sub("", (company_name or "").lower().strip()))
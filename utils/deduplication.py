@@ -3,44 +3,30 @@ Deduplication module for company records.
 Uses fuzzy matching to identify and merge duplicate companies.
 """
 
-import re
-from typing import List, Dict, Any, Tuple
-from rapidfuzz import fuzz
+from collections import defaultdict
+from dataclasses import replace
+from typing import List, Dict, Any, Tuple, Optional
+import numpy as np
+from rapidfuzz import fuzz, process
 
+from sources.types import Company
+from utils.company_names import normalize_company_name
 
-# Suffixes to remove when normalizing company names
-COMPANY_SUFFIXES = [
-    r"\s*,?\s*inc\.?$",
-    r"\s*,?\s*llc\.?$",
-    r"\s*,?\s*ltd\.?$",
-    r"\s*,?\s*corp\.?$",
-    r"\s*,?\s*corporation$",
-    r"\s*,?\s*incorporated$",
-    r"\s*,?\s*limited$",
-    r"\s*,?\s*l\.?l\.?c\.?$",
-    r"\s*,?\s*company$",
-    r"\s*,?\s*co\.?$",
-    r"\s*,?\s*holdings?$",
-    r"\s*,?\s*group$",
-    r"\s*,?\s*partners?$",
-    r"\s*,?\s*ventures?$",
-    r"\s*,?\s*capital$",
-    r"\s*,?\s*fund$",
-    r"\s*,?\s*lp$",
-    r"\s*,?\s*l\.?p\.?$",
-]
+
+# Scalar fields filled from lower-priority records when the merged record lacks them
+_MERGE_FILL_FIELDS = ("company_website", "description", "industry", "location", "ceo_name", "funding_amount")
 
 # Minimum similarity score for fuzzy matching (0-100)
 FUZZY_MATCH_THRESHOLD = 85
 
 
-def deduplicate_companies(companies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def deduplicate_companies(companies: List[Company]) -> List[Company]:
     """
     Deduplicate a list of companies using fuzzy name matching.
     Merges data from multiple sources, preferring SEC data for official info.
     
     Args:
-        companies: List of company dictionaries from various sources.
+        companies: List of Company records from various sources.
         
     Returns:
         Deduplicated list of companies with merged data.
@@ -50,16 +36,20 @@ def deduplicate_companies(companies: List[Dict[str, Any]]) -> List[Dict[str, Any
     print(f"{'='*60}")
     print(f"  Input: {len(companies)} companies")
     
-    if not companies:
-        return []
+    # Nothing to compare against
+    if len(companies) <= 1:
+        print(f"  Output: {len(companies)} unique companies")
+        return list(companies)
     
-    # Group companies by normalized name
-    grouped = _group_similar_companies(companies)
+    # Fuzzy matching only reads names, so it runs on a flat list of
+    # normalized names; records are looked up by index only at merge time
+    names = [normalize_company_name(c.company_name) for c in companies]
+    grouped = _group_similar_names(names)
     
     # Merge each group into a single company record
     deduplicated = []
     for group in grouped:
-        merged = _merge_company_group(group)
+        merged = merge_company_group([companies[i] for i in group])
         if merged:
             deduplicated.append(merged)
     
@@ -69,78 +59,96 @@ def deduplicate_companies(companies: List[Dict[str, Any]]) -> List[Dict[str, Any
     return deduplicated
 
 
-def _normalize_company_name(name: str) -> str:
-    """
-    Normalize a company name for comparison.
-    - Lowercase
-    - Remove common suffixes (Inc, LLC, Corp, etc.)
-    - Remove extra whitespace
-    - Remove special characters
-    """
-    if not name:
-        return ""
+class _DSU:
+    """Disjoint-set forest with path compression and union by rank."""
     
-    normalized = name.lower().strip()
+    __slots__ = ("parent", "rank")
     
-    # Remove common suffixes
-    for pattern in COMPANY_SUFFIXES:
-        normalized = re.sub(pattern, "", normalized, flags=re.IGNORECASE)
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+        self.rank = [0] * size
     
-    # Remove special characters but keep spaces
-    normalized = re.sub(r'[^\w\s]', '', normalized)
+    def find(self, i: int) -> int:
+        parent = self.parent
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        while parent[i] != root:
+            parent[i], i = root, parent[i]
+        return root
     
-    # Normalize whitespace
-    normalized = re.sub(r'\s+', ' ', normalized).strip()
-    
-    return normalized
+    def union(self, i: int, j: int) -> None:
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i == root_j:
+            return
+        if self.rank[root_i] < self.rank[root_j]:
+            root_i, root_j = root_j, root_i
+        self.parent[root_j] = root_i
+        if self.rank[root_i] == self.rank[root_j]:
+            self.rank[root_i] += 1
 
 
-def _group_similar_companies(companies: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+def _group_similar_names(normalized: List[str]) -> List[List[int]]:
     """
-    Group companies with similar names together using fuzzy matching.
+    Group indices of similar normalized names together using fuzzy matching.
+    
+    Names are first blocked by the first three characters of their sorted-tokens
+    form (the form token_sort_ratio compares), so only names within the same
+    block are compared and reordered names like "AI Open" / "Open AI" still
+    meet; each block is then scored in one vectorized rapidfuzz call. Matches
+    are transitive: if A~B and B~C, all three end up in the same group.
     """
-    if not companies:
+    if not normalized:
         return []
     
-    # Create normalized name lookup
-    normalized_names = [
-        (_normalize_company_name(c.get("company_name", "")), c) 
-        for c in companies
-    ]
-    
-    # Track which companies have been grouped
-    used = set()
-    groups = []
+    # Blocking step; the sorted-tokens form starts with the smallest token.
+    # Names that normalize to "" never match anything.
+    buckets: Dict[str, List[int]] = defaultdict(list)
+    for i, name in enumerate(normalized):
+        if name:
+            buckets[min(name.split(" "))[:3]].append(i)
     
-    for i, (norm_name_i, company_i) in enumerate(normalized_names):
-        if i in used:
+    dsu = _DSU(len(normalized))
+    for indices in buckets.values():
+        if len(indices) < 2:
             continue
-        
-        # Start a new group
-        group = [company_i]
-        used.add(i)
-        
-        # Find similar companies
-        for j, (norm_name_j, company_j) in enumerate(normalized_names):
-            if j in used:
-                continue
-            
-            # Check similarity
-            similarity = _calculate_similarity(norm_name_i, norm_name_j)
-            
-            if similarity >= FUZZY_MATCH_THRESHOLD:
-                group.append(company_j)
-                used.add(j)
-        
-        groups.append(group)
+        for a, b in _similar_pairs([normalized[i] for i in indices]):
+            dsu.union(indices[a], indices[b])
+    
+    # Groups come out in input order of their first member
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for i in range(len(normalized)):
+        groups[dsu.find(i)].append(i)
+    
+    return list(groups.values())
+
+
+def _similar_pairs(names: List[str]) -> List[Tuple[int, int]]:
+    """
+    Index pairs (within `names`) scoring at or above FUZZY_MATCH_THRESHOLD.
+    """
+    if len(names) == 2:
+        # Cheaper to score a single pair directly than to set up cdist
+        if _calculate_similarity(names[0], names[1]) >= FUZZY_MATCH_THRESHOLD:
+            return [(0, 1)]
+        return []
     
-    return groups
+    scores = process.cdist(
+        names,
+        names,
+        scorer=fuzz.token_sort_ratio,
+        score_cutoff=FUZZY_MATCH_THRESHOLD,
+        dtype=np.uint8,
+        workers=-1
+    )
+    return np.argwhere(scores >= FUZZY_MATCH_THRESHOLD)
 
 
 def _calculate_similarity(name1: str, name2: str) -> float:
     """
     Calculate similarity between two normalized company names.
     Uses a combination of fuzzy matching techniques.
+    Scores below FUZZY_MATCH_THRESHOLD are reported as 0.
     """
     if not name1 or not name2:
         return 0.0
@@ -149,14 +157,21 @@ def _calculate_similarity(name1: str, name2: str) -> float:
     if name1 == name2:
         return 100.0
     
+    # The ratio is at most 2*shorter/(shorter+longer), so names whose
+    # lengths are too far apart can never reach the threshold (at 85 that
+    # is roughly a 26% length difference); skip tokenizing and sorting them
+    shorter, longer = sorted((len(name1), len(name2)))
+    if shorter * (200 - FUZZY_MATCH_THRESHOLD) < longer * FUZZY_MATCH_THRESHOLD:
+        return 0.0
+    
     # Use token sort ratio for better matching of reordered words
-    # e.g., "Open AI" vs "OpenAI" or "AI Open"
-    ratio = fuzz.token_sort_ratio(name1, name2)
+    # e.g., "Open AI" vs "AI Open"
+    ratio = fuzz.token_sort_ratio(name1, name2, score_cutoff=FUZZY_MATCH_THRESHOLD)
     
     return ratio
 
 
-def _merge_company_group(group: List[Dict[str, Any]]) -> Dict[str, Any]:
+def merge_company_group(group: List[Company]) -> Optional[Company]:
     """
     Merge a group of duplicate companies into a single record.
     Prioritizes SEC Form D data for official information.
@@ -179,60 +194,37 @@ def _merge_company_group(group: List[Dict[str, Any]]) -> Dict[str, Any]:
     
     sorted_group = sorted(
         group, 
-        key=lambda x: source_priority.get(x.get("source", ""), 999)
+        key=lambda x: source_priority.get(x.source, 999)
+    )
+    
+    # Start with a copy of the highest priority record, with investors from
+    # every record merged in priority order (dict keeps order and dedupes)
+    merged = replace(
+        sorted_group[0],
+        investors=list(dict.fromkeys(inv for c in sorted_group for inv in (c.investors or []) if inv))
     )
     
-    # Start with the highest priority record
-    merged = sorted_group[0].copy()
+    # Collect all sources (records may already carry sources merged upstream)
+    all_sources = list(dict.fromkeys(s for c in group for s in (c.sources or [c.source]) if s))
+    merged.sources = all_sources
     
-    # Collect all sources
-    all_sources = list(set(c.get("source", "") for c in group if c.get("source")))
-    merged["sources"] = all_sources
+    # Fill in missing fields from the highest priority record that has them
+    for field_name in _MERGE_FILL_FIELDS:
+        if not getattr(merged, field_name):
+            value = next((getattr(c, field_name) for c in sorted_group[1:] if getattr(c, field_name)), None)
+            if value:
+                setattr(merged, field_name, value)
     
-    # Merge data from other records (fill in missing fields)
+    # Fill in missing funding round from news (often more specific)
     for company in sorted_group[1:]:
-        # Fill in missing website
-        if not merged.get("company_website") and company.get("company_website"):
-            merged["company_website"] = company["company_website"]
-        
-        # Fill in missing description
-        if not merged.get("description") and company.get("description"):
-            merged["description"] = company["description"]
-        
-        # Merge investors lists
-        existing_investors = set(merged.get("investors", []))
-        new_investors = company.get("investors", [])
-        if new_investors:
-            for inv in new_investors:
-                if inv and inv not in existing_investors:
-                    merged.setdefault("investors", []).append(inv)
-                    existing_investors.add(inv)
-        
-        # Fill in missing funding round from news (often more specific)
-        if merged.get("funding_round") in ["Unknown", "Equity", None] and company.get("funding_round"):
-            if company.get("funding_round") not in ["Unknown", None]:
-                merged["funding_round"] = company["funding_round"]
-        
-        # Fill in missing industry
-        if not merged.get("industry") and company.get("industry"):
-            merged["industry"] = company["industry"]
-        
-        # Fill in missing location
-        if not merged.get("location") and company.get("location"):
-            merged["location"] = company["location"]
-        
-        # Fill in missing CEO name
-        if not merged.get("ceo_name") and company.get("ceo_name"):
-            merged["ceo_name"] = company["ceo_name"]
-        
-        # Prefer larger funding amount if SEC amount is missing
-        if not merged.get("funding_amount") and company.get("funding_amount"):
-            merged["funding_amount"] = company["funding_amount"]
+        if merged.funding_round in ["Unknown", "Equity", None] and company.funding_round:
+            if company.funding_round not in ["Unknown", None]:
+                merged.funding_round = company.funding_round
     
     return merged
 
 
-def get_dedup_stats(original: List[Dict[str, Any]], deduped: List[Dict[str, Any]]) -> Dict[str, Any]:
+def get_dedup_stats(original: List[Company], deduped: List[Company]) -> Dict[str, Any]:
     """
     Get statistics about the deduplication process.
     """
@@ -242,11 +234,11 @@ def get_dedup_stats(original: List[Dict[str, Any]], deduped: List[Dict[str, Any]
     # Count by source
     original_by_source = {}
     for c in original:
-        source = c.get("source", "Unknown")
+        source = c.source or "Unknown"
         original_by_source[source] = original_by_source.get(source, 0) + 1
     
     # Count merged sources
-    merged_count = sum(1 for c in deduped if len(c.get("sources", [])) > 1)
+    merged_count = sum(1 for c in deduped if len(c.sources) > 1)
     
     return {
         "original_count": original_count,
@@ -260,15 +252,15 @@ def get_dedup_stats(original: List[Dict[str, Any]], deduped: List[Dict[str, Any]
 if __name__ == "__main__":
     # Test the module
     test_companies = [
-        {"company_name": "OpenAI, Inc.", "source": "SEC Form D", "funding_amount": 1000000},
-        {"company_name": "OpenAI", "source": "TechCrunch", "funding_amount": 1000000, "description": "AI company"},
-        {"company_name": "Open AI LLC", "source": "VentureBeat", "investors": ["Microsoft"]},
-        {"company_name": "Stripe, Inc.", "source": "SEC Form D"},
-        {"company_name": "Stripe", "source": "CB Insights", "funding_round": "Series I"},
+        Company(company_name="OpenAI, Inc.", source="SEC Form D", funding_amount=1000000),
+        Company(company_name="OpenAI", source="TechCrunch", funding_amount=1000000, description="AI company"),
+        Company(company_name="Open AI LLC", source="VentureBeat", investors=["Microsoft"]),
+        Company(company_name="Stripe, Inc.", source="SEC Form D"),
+        Company(company_name="Stripe", source="CB Insights", funding_round="Series I"),
     ]
     
     deduped = deduplicate_companies(test_companies)
     print(f"\nDeduplication result:")
     for c in deduped:
-        print(f"  - {c['company_name']} (sources: {c.get('sources', [c.get('source')])})")
+        print(f"  - {c.company_name} (sources: {c.sources or [c.source]})")
 
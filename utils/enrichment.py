@@ -3,21 +3,106 @@ Website enrichment module using Perplexity AI.
 Finds company websites for records that don't have them.
 """
 
-import requests
-import time
+import asyncio
+import aiohttp
+import html
+import logging
 import re
-from typing import List, Dict, Any, Optional
+import time
+from urllib.parse import urlsplit
+from typing import List, Dict, Any, Optional, Tuple
 
 import config
+from sources.types import Company
+from utils import json_codec, website_cache
+from utils.company_names import company_name_key
+from utils.http_client import AsyncTokenBucket, CircuitBreaker, backoff_delay, parse_retry_after, run_sync
+
+
+# Patterns used when parsing responses (compiled once at import)
+_URL_RE = re.compile(r'https?://[^\s<>"\')\]]+(?:\.[^\s<>"\')\]]+)+')
+_DOMAIN_RE = re.compile(r'^(?:www\.)?([a-zA-Z0-9-]+(?:\.[a-zA-Z]{2,})+)$')
+_TLD_RE = re.compile(r'\.[a-zA-Z]{2,}(?:/|$)')
+_TITLE_RE = re.compile(r'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+_NOT_FOUND_RE = re.compile(r'not[ _]found|unable to find|could not find|\bn/a\b|\bunknown\b', re.IGNORECASE)
+
+# Hosts (and their subdomains) that are never a company's own website
+_EXCLUDED_DOMAINS = frozenset({
+    'linkedin.com', 'twitter.com', 'facebook.com', 'instagram.com',
+    'youtube.com', 'crunchbase.com', 'pitchbook.com', 'bloomberg.com',
+    'sec.gov', 'wikipedia.org', 'google.com', 'bing.com'
+})
+
+# Structured answers: {"url": ...} for one company, {"websites": [...]} for a batch
+_URL_SCHEMA = {
+    "type": "object",
+    "properties": {"url": {"type": "string"}},
+    "required": ["url"]
+}
+_BATCH_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "websites": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"index": {"type": "integer"}, "url": {"type": "string"}},
+                "required": ["index", "url"]
+            }
+        }
+    },
+    "required": ["websites"]
+}
+_URL_MAX_TOKENS = 60  # one JSON-wrapped URL, with headroom for long paths
+
+# Shorter names collide with unrelated domains too often to guess
+_GUESS_MIN_SLUG = 4
+_GUESS_PAGE_BYTES = 65536  # enough to reach <title> in the page head
+
+logger = logging.getLogger(__name__)
+
+# Progress is logged once per this many finished lookups
+_PROGRESS_EVERY = 10
+
+# Paces every website lookup request (retries included)
+_rate_limiter = AsyncTokenBucket(config.PERPLEXITY_ENRICH_RATE_PER_SEC, config.PERPLEXITY_ENRICH_RATE_BURST)
+
+# After 5 lookups in a row fail outright (API down, bad key), stop asking
+# Perplexity for 60 seconds instead of retrying every remaining company
+_breaker = CircuitBreaker("Perplexity", threshold=5, cooldown=60)
+
+# Lookups currently waiting on Perplexity, by (name, industry, location) like
+# the cache; a second lookup of the same company awaits the first one's
+# answer instead of re-asking
+_inflight: Dict[Tuple[str, str, str], asyncio.Future] = {}
+
+
+def enrich_with_websites(companies: List[Company]) -> List[Company]:
+    """
+    Enrich company records with website URLs using Perplexity AI.
+    Synchronous wrapper around enrich_with_websites_async().
+    
+    Args:
+        companies: List of Company records.
+        
+    Returns:
+        List of companies with website data enriched.
+    """
+    return run_sync(enrich_with_websites_async(companies))
 
 
-def enrich_with_websites(companies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+async def enrich_with_websites_async(
+    companies: List[Company],
+    concurrency: int = config.PERPLEXITY_ENRICH_CONCURRENCY
+) -> List[Company]:
     """
     Enrich company records with website URLs using Perplexity AI.
-    Only queries for companies that don't already have a website.
+    Only queries for companies that don't already have a website; up to
+    `concurrency` lookups are in flight at once.
     
     Args:
-        companies: List of company dictionaries.
+        companies: List of Company records.
+        concurrency: Maximum number of concurrent Perplexity requests.
         
     Returns:
         List of companies with website data enriched.
@@ -27,47 +112,296 @@ def enrich_with_websites(companies: List[Dict[str, Any]]) -> List[Dict[str, Any]
     print(f"{'='*60}")
     
     # Count companies needing website lookup
-    need_website = [c for c in companies if not c.get("company_website")]
+    need_website = [c for c in companies if not c.company_website]
     print(f"  Companies needing website lookup: {len(need_website)}/{len(companies)}")
     
+    targets = [c for c in need_website if c.company_name]
+    enriched_count = await _enrich_companies(targets, concurrency)
+    
+    print(f"  Enriched {enriched_count} companies with websites")
+    
+    return companies
+
+
+async def _enrich_companies(targets: List[Company], concurrency: int) -> int:
+    """
+    Look up websites for `targets` concurrently and fill them in as results arrive.
+    Returns the number of companies enriched.
+    """
+    if not targets:
+        return 0
+    
     enriched_count = 0
+    semaphore = asyncio.Semaphore(concurrency)
     
-    for i, company in enumerate(companies):
-        if company.get("company_website"):
-            continue  # Already has website
-        
-        company_name = company.get("company_name", "")
-        industry = company.get("industry", "")
-        location = company.get("location", "")
+    # Keep-alive pool so every lookup and retry reuses an open TCP/TLS
+    # connection; auth headers are set once on the session
+    connector = aiohttp.TCPConnector(limit_per_host=concurrency, keepalive_timeout=30)
+    headers = {
+        "Authorization": f"Bearer {config.PERPLEXITY_API_KEY}",
+        "Content-Type": "application/json"
+    }
+    
+    # Website guesses go to arbitrary hosts, so they get their own session
+    # without the Perplexity credentials
+    async with (
+        aiohttp.ClientSession(connector=connector, headers=headers) as session,
+        aiohttp.ClientSession() as probe_session
+    ):
+        # Companies are looked up K at a time with one multi-company prompt
+        size = config.PERPLEXITY_ENRICH_BATCH_SIZE
+        tasks = [
+            asyncio.create_task(_lookup_batch(targets[i:i + size], session, probe_session, semaphore))
+            for i in range(0, len(targets), size)
+        ]
         
-        if not company_name:
+        # Per-company results are debug output; progress is reported in
+        # aggregate so concurrent lookups don't contend on stdout
+        done = 0
+        for task in asyncio.as_completed(tasks):
+            for company, website in await task:
+                done += 1
+                if website:
+                    company.company_website = website
+                    enriched_count += 1
+                    logger.debug("  [%d/%d] %s: Found: %s", done, len(targets), company.company_name, website)
+                else:
+                    logger.debug("  [%d/%d] %s: Not found", done, len(targets), company.company_name)
+                
+                if done % _PROGRESS_EVERY == 0 or done == len(targets):
+                    logger.info("  [%d/%d] processed, %d enriched", done, len(targets), enriched_count)
+    
+    return enriched_count
+
+
+async def _lookup_batch(
+    companies: List[Company],
+    session: aiohttp.ClientSession,
+    probe_session: aiohttp.ClientSession,
+    semaphore: asyncio.Semaphore
+) -> List[Tuple[Company, Optional[str]]]:
+    """
+    _lookup_websites() for one batch, reporting an unexpected error as "not
+    found" for that batch so it can't abort every other lookup.
+    """
+    try:
+        return await _lookup_websites(companies, session, probe_session, semaphore)
+    except Exception as e:
+        logger.warning("  Website lookup failed for %d companies: %r", len(companies), e)
+        return [(company, None) for company in companies]
+
+
+async def _lookup_websites(
+    companies: List[Company],
+    session: aiohttp.ClientSession,
+    probe_session: aiohttp.ClientSession,
+    semaphore: asyncio.Semaphore
+) -> List[Tuple[Company, Optional[str]]]:
+    """
+    Find websites for one batch of companies. Cached answers are used as-is,
+    and names already being looked up elsewhere wait for that answer; the
+    rest are asked for in a single request once a concurrency slot is free.
+    """
+    websites: Dict[int, Optional[str]] = {}
+    pending = []
+    owned: Dict[Tuple[str, str, str], asyncio.Future] = {}
+    waiting: Dict[int, asyncio.Future] = {}
+    
+    for i, company in enumerate(companies):
+        cached = _cached_website(company.company_name, company.industry, company.location)
+        if cached is not website_cache.MISS:
+            websites[i] = cached
             continue
         
-        # Rate limiting
-        if i > 0:
-            time.sleep(config.PERPLEXITY_API_DELAY)
+        key = _inflight_key(company)
+        if key in _inflight:
+            waiting[i] = _inflight[key]
+        else:
+            owned[key] = _inflight[key] = asyncio.get_running_loop().create_future()
+            pending.append(i)
+    
+    try:
+        if pending:
+            await _resolve_pending(companies, pending, websites, owned, session, probe_session, semaphore)
+    finally:
+        # Never leave waiters hanging, even if this lookup failed
+        for key, future in owned.items():
+            if not future.done():
+                future.set_result(None)
+            del _inflight[key]
+    
+    for i, future in waiting.items():
+        company = companies[i]
+        websites[i] = await future
+        website_cache.put(company.company_name, company.industry, company.location, websites[i])
+    
+    return [(company, websites[i]) for i, company in enumerate(companies)]
+
+
+async def _resolve_pending(
+    companies: List[Company],
+    pending: List[int],
+    websites: Dict[int, Optional[str]],
+    owned: Dict[Tuple[str, str, str], asyncio.Future],
+    session: aiohttp.ClientSession,
+    probe_session: aiohttp.ClientSession,
+    semaphore: asyncio.Semaphore
+) -> None:
+    """
+    Resolve the uncached companies at `pending` positions, recording each
+    answer in `websites` and on its in-flight future. Obvious domains are
+    tried first; Perplexity is asked about whatever is left.
+    """
+    if config.WEBSITE_GUESS_ENABLED:
+        guesses = await asyncio.gather(*(
+            _guess_website(probe_session, companies[i].company_name) for i in pending
+        ))
+        unresolved = []
+        for i, website in zip(pending, guesses):
+            if website:
+                _record_answer(companies[i], website, i, websites, owned)
+            else:
+                unresolved.append(i)
+        pending = unresolved
         
-        print(f"  [{i+1}/{len(need_website)}] Looking up website for: {company_name}")
+        if not pending:
+            return
+    
+    async with semaphore:
+        if len(pending) == 1:
+            answers = {}
+        else:
+            answers = await _query_company_websites(session, [companies[i] for i in pending]) or {}
         
-        website = _find_company_website(company_name, industry, location)
+        found = []
+        for n, i in enumerate(pending):
+            company = companies[i]
+            if n in answers:
+                website = answers[n]
+            else:
+                # Not covered by the batch answer: ask for this one alone
+                website = await _query_company_website(
+                    session,
+                    company.company_name,
+                    company.industry,
+                    company.location
+                )
+            found.append(website)
+    
+    # Check every answer of the batch at once, outside the Perplexity slot
+    if config.WEBSITE_VERIFY_ENABLED:
+        found = await asyncio.gather(*(_verify_website(probe_session, website) for website in found))
+    
+    for i, website in zip(pending, found):
+        _record_answer(companies[i], website, i, websites, owned)
+
+
+def _record_answer(
+    company: Company,
+    website: Optional[str],
+    i: int,
+    websites: Dict[int, Optional[str]],
+    owned: Dict[Tuple[str, str, str], asyncio.Future]
+) -> None:
+    """
+    Cache a freshly resolved answer and hand it to any coalesced waiters.
+    """
+    website_cache.put(company.company_name, company.industry, company.location, website)
+    websites[i] = website
+    owned[_inflight_key(company)].set_result(website)
+
+
+async def _guess_website(session: aiohttp.ClientSession, company_name: str) -> Optional[str]:
+    """
+    Try the obvious domains for a company name (www.<name>.com, <name>.ai,
+    <name>.io). A candidate is accepted only if it answers without an error,
+    still lives on a host containing the name after redirects (so domain
+    resellers are rejected), and the page title names the company too; a
+    live domain alone is not enough for common words like "Summit".
+    """
+    slug = company_name_key(company_name)
+    if len(slug) < _GUESS_MIN_SLUG:
+        return None
+    
+    for candidate in (f"https://www.{slug}.com", f"https://{slug}.ai", f"https://{slug}.io"):
+        try:
+            async with session.get(
+                candidate,
+                allow_redirects=True,
+                timeout=aiohttp.ClientTimeout(total=5)
+            ) as response:
+                if response.status >= 400 or slug not in (response.url.host or ""):
+                    continue
+                website = str(response.url.origin())
+                page = await response.content.read(_GUESS_PAGE_BYTES)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            continue
         
-        if website:
-            company["company_website"] = website
-            enriched_count += 1
-            print(f"    Found: {website}")
-        else:
-            print(f"    Not found")
+        title = _TITLE_RE.search(page.decode("utf-8", "ignore"))
+        if title and slug in company_name_key(html.unescape(title.group(1))) and _is_valid_website(website):
+            return website
     
-    print(f"  Enriched {enriched_count} companies with websites")
+    return None
+
+
+async def _verify_website(session: aiohttp.ClientSession, website: Optional[str]) -> Optional[str]:
+    """
+    HEAD-check a URL from Perplexity, which sometimes invents domains.
+    The URL is kept only if it answers 2xx/3xx and still ends up on a
+    valid website after redirects.
+    """
+    if not website:
+        return None
     
-    return companies
+    try:
+        async with session.head(
+            website,
+            allow_redirects=True,
+            timeout=aiohttp.ClientTimeout(total=5)
+        ) as response:
+            if 200 <= response.status < 400 and _is_valid_website(str(response.url)):
+                return website
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+        pass
+    
+    return None
+
+
+def _inflight_key(company: Company) -> Tuple[str, str, str]:
+    """
+    Key under which concurrent lookups of the same company are coalesced.
+    Industry and location are part of it, so same-named companies elsewhere
+    don't share (and cache) each other's answer.
+    """
+    return (
+        company.company_name.lower().strip(),
+        (company.industry or "").strip().lower(),
+        (company.location or "").strip().lower()
+    )
+
+
+def _cached_website(company_name: str, industry: str, location: str):
+    """
+    Look up a cached website for this company or a near-identical name.
+    Returns the URL, None for a cached "not found", or website_cache.MISS.
+    """
+    cached = website_cache.get(company_name, industry, location)
+    if cached is not website_cache.MISS:
+        return cached
+    
+    # Same company under a slightly different spelling
+    website = website_cache.get_similar(company_name, industry, location)
+    if website:
+        website_cache.put(company_name, industry, location, website)
+        return website
+    
+    return website_cache.MISS
 
 
-def _find_company_website(company_name: str, industry: str = "", location: str = "") -> Optional[str]:
+def _describe_company(company_name: str, industry: str, location: str) -> str:
     """
-    Find a company's website using Perplexity AI.
+    Company name plus the industry/location context used in prompts.
     """
-    # Build context for the search
     context_parts = []
     if industry:
         context_parts.append(f"in the {industry} industry")
@@ -75,38 +409,109 @@ def _find_company_website(company_name: str, industry: str = "", location: str =
         context_parts.append(f"based in {location}")
     
     context = " ".join(context_parts) if context_parts else "that recently raised funding"
+    return f'"{company_name}" {context}'
+
+
+async def _query_company_website(
+    session: aiohttp.ClientSession,
+    company_name: str,
+    industry: str,
+    location: str
+) -> Optional[str]:
+    """
+    Ask Perplexity AI for a company's website.
+    The answer is constrained to {"url": ...}; free text is still handled
+    in case the schema is not applied.
+    """
+    prompt = f"""What is the official company website URL for {_describe_company(company_name, industry, location)}?
+
+Answer with the website URL as "url". If you cannot find the official website, use "NOT_FOUND"."""
+
+    response = await _make_perplexity_request(
+        prompt,
+        session,
+        max_tokens=_URL_MAX_TOKENS,
+        schema=_URL_SCHEMA
+    )
+    if not response:
+        return None
+    
+    data = json_codec.extract_json(response)
+    if isinstance(data, dict) and "url" in data:
+        response = str(data["url"] or "")
+    
+    return _extract_website_from_response(response)
+
+
+async def _query_company_websites(
+    session: aiohttp.ClientSession,
+    companies: List[Company]
+) -> Optional[Dict[int, Optional[str]]]:
+    """
+    Ask Perplexity AI for several companies' websites in one request.
+    Returns answers keyed by position in `companies`, or None if the
+    response could not be parsed. Companies missing from the answer are
+    left out of the mapping.
+    """
+    listing = "\n".join(
+        f"{n}. {_describe_company(c.company_name, c.industry, c.location)}"
+        for n, c in enumerate(companies, 1)
+    )
     
-    prompt = f"""What is the official company website URL for "{company_name}" {context}?
+    prompt = f"""What is the official company website URL for each of these companies?
 
-Return ONLY the website URL, nothing else. If you cannot find the official website, return "NOT_FOUND".
+{listing}
 
-Example response: https://www.example.com"""
+Answer with one entry per company in "websites", giving the company's number from the list as "index" and its website URL as "url".
+If you cannot find a company's official website, use "NOT_FOUND" as its url."""
 
-    response = _make_perplexity_request(prompt)
+    response = await _make_perplexity_request(
+        prompt,
+        session,
+        max_tokens=_URL_MAX_TOKENS * len(companies),
+        timeout=90,
+        schema=_BATCH_SCHEMA
+    )
     
-    if response:
-        website = _extract_website_from_response(response)
-        if website:
-            return website
+    data = json_codec.extract_json(response) if response else None
+    if isinstance(data, dict):
+        data = data.get("websites")
+    if not isinstance(data, list):
+        return None
     
-    return None
+    answers = {}
+    for item in data:
+        if not isinstance(item, dict):
+            continue
+        index = item.get("index")
+        if isinstance(index, int) and 1 <= index <= len(companies):
+            answers[index - 1] = _extract_website_from_response(str(item.get("url") or ""))
+    
+    return answers
 
 
-def _make_perplexity_request(prompt: str) -> Optional[str]:
+async def _make_perplexity_request(
+    prompt: str,
+    session: aiohttp.ClientSession,
+    max_tokens: int = 200,
+    timeout: float = 30,
+    schema: Optional[Dict[str, Any]] = None
+) -> Optional[str]:
     """
     Make a request to Perplexity AI API.
+    The session carries the auth headers and connection pool. With a
+    `schema`, the answer is constrained to JSON matching it.
+    Returns None immediately while the circuit breaker is open.
     """
-    headers = {
-        "Authorization": f"Bearer {config.PERPLEXITY_API_KEY}",
-        "Content-Type": "application/json"
-    }
+    if not _breaker.allow_request():
+        return None
     
     payload = {
         "model": "sonar",
         "messages": [
             {
                 "role": "system",
-                "content": "You are a research assistant that finds company websites. Return only the URL, nothing else."
+                "content": "You are a research assistant that finds official company websites. Answer in exactly the format requested, nothing else."
             },
             {
                 "role": "user",
@@ -114,32 +519,69 @@ def _make_perplexity_request(prompt: str) -> Optional[str]:
             }
         ],
         "temperature": 0.1,
-        "max_tokens": 200
+        "max_tokens": max_tokens
     }
+    if schema is not None:
+        payload["response_format"] = {"type": "json_schema", "json_schema": {"schema": schema}}
+    body = json_codec.dumps(payload)
     
     for attempt in range(1, config.MAX_RETRIES + 1):
+        retry_after = None
+        
         try:
-            response = requests.post(
+            await _rate_limiter.acquire()
+            async with session.post(
                 config.PERPLEXITY_API_ENDPOINT,
-                json=payload,
-                headers=headers,
-                timeout=30
-            )
-            response.raise_for_status()
+                data=body,
+                timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as response:
+                _apply_rate_limit_headers(response.headers)
+                
+                if response.status == 429 or response.status >= 500:
+                    # Rate limited or server error: worth retrying
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    error = f"HTTP {response.status}"
+                elif response.status >= 400:
+                    # Other client errors won't succeed on retry
+                    print(f"    API error: HTTP {response.status} (not retrying)")
+                    break
+                else:
+                    result = await response.json(loads=json_codec.loads)
+                    content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
+                    _breaker.record_success()
+                    return content
             
-            result = response.json()
-            content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
-            return content
-            
-        except requests.exceptions.RequestException as e:
-            if attempt < config.MAX_RETRIES:
-                time.sleep(config.RETRY_DELAY * attempt)
-            else:
-                print(f"    API error: {e}")
+        except (aiohttp.ClientError, json_codec.JSONDecodeError, asyncio.TimeoutError) as e:
+            error = repr(e)
+        
+        if attempt < config.MAX_RETRIES:
+            await asyncio.sleep(backoff_delay(attempt, retry_after))
+        else:
+            print(f"    API error: {error}")
     
+    _breaker.record_failure()
     return None
 
 
+def _apply_rate_limit_headers(headers) -> None:
+    """
+    If the server reports no requests left in the current window, pause the
+    rate limiter until the window resets (seconds, or an epoch timestamp).
+    """
+    if headers.get("X-RateLimit-Remaining") != "0":
+        return
+    
+    try:
+        reset = float(headers.get("X-RateLimit-Reset", ""))
+    except ValueError:
+        return
+    
+    if reset > 1e9:
+        reset -= time.time()
+    if reset > 0:
+        _rate_limiter.defer(reset)
+
+
 def _extract_website_from_response(response: str) -> Optional[str]:
     """
     Extract and validate a website URL from the Perplexity response.
@@ -150,13 +592,12 @@ def _extract_website_from_response(response: str) -> Optional[str]:
     response = response.strip()
     
     # Check for "not found" responses
-    not_found_patterns = ["not_found", "not found", "unable to find", "could not find", "n/a", "unknown"]
-    if any(pattern in response.lower() for pattern in not_found_patterns):
+    if _NOT_FOUND_RE.search(response):
         return None
     
-    # Try to extract URL from response
-    url_pattern = r'https?://[^\s<>"\')\]]+(?:\.[^\s<>"\')\]]+)+'
-    matches = re.findall(url_pattern, response)
+    # Try to extract URL from response; most answers are a bare domain or
+    # "NOT_FOUND", so skip the scan when no scheme can be present
+    matches = _URL_RE.findall(response) if "http" in response else None
     
     if matches:
         url = matches[0]
@@ -168,10 +609,9 @@ def _extract_website_from_response(response: str) -> Optional[str]:
             return url
     
     # If no URL found but response looks like a domain, add https://
-    domain_pattern = r'^(?:www\.)?([a-zA-Z0-9-]+(?:\.[a-zA-Z]{2,})+)$'
-    domain_match = re.match(domain_pattern, response.strip())
+    domain_match = _DOMAIN_RE.match(response)
     if domain_match:
-        url = f"https://{response.strip()}"
+        url = f"https://{response}"
         if _is_valid_website(url):
             return url
     
@@ -185,37 +625,52 @@ def _is_valid_website(url: str) -> bool:
     if not url:
         return False
     
-    # Must start with http:// or https://
-    if not url.startswith(('http://', 'https://')):
+    parts = urlsplit(url)
+    
+    # Must be an http:// or https:// URL
+    if parts.scheme not in ('http', 'https'):
         return False
     
     # Must have a valid TLD
-    tld_pattern = r'\.[a-zA-Z]{2,}(?:/|$)'
-    if not re.search(tld_pattern, url):
+    if not _TLD_RE.search(url):
         return False
     
-    # Exclude common non-company domains
-    excluded_domains = [
-        'linkedin.com', 'twitter.com', 'facebook.com', 'instagram.com',
-        'youtube.com', 'crunchbase.com', 'pitchbook.com', 'bloomberg.com',
-        'sec.gov', 'wikipedia.org', 'google.com', 'bing.com'
-    ]
-    
-    for domain in excluded_domains:
-        if domain in url.lower():
-            return False
+    # Exclude common non-company domains, including their subdomains
+    labels = (parts.hostname or '').removeprefix('www.').split('.')
+    if any('.'.join(labels[i:]) in _EXCLUDED_DOMAINS for i in range(len(labels))):
+        return False
     
     return True
 
 
-def batch_enrich_websites(companies: List[Dict[str, Any]], max_lookups: int = 50) -> List[Dict[str, Any]]:
+def batch_enrich_websites(companies: List[Company], max_lookups: int = 50) -> List[Company]:
+    """
+    Enrich websites with a limit on the number of API calls.
+    Synchronous wrapper around batch_enrich_websites_async().
+    
+    Args:
+        companies: List of Company records.
+        max_lookups: Maximum number of website lookups to perform.
+        
+    Returns:
+        List of companies with website data enriched (up to max_lookups).
+    """
+    return run_sync(batch_enrich_websites_async(companies, max_lookups))
+
+
+async def batch_enrich_websites_async(
+    companies: List[Company],
+    max_lookups: int = 50,
+    concurrency: int = config.PERPLEXITY_ENRICH_CONCURRENCY
+) -> List[Company]:
     """
     Enrich websites with a limit on the number of API calls.
     Useful for large datasets to control API usage.
     
     Args:
-        companies: List of company dictionaries.
+        companies: List of Company records.
         max_lookups: Maximum number of website lookups to perform.
+        concurrency: Maximum number of concurrent Perplexity requests.
         
     Returns:
         List of companies with website data enriched (up to max_lookups).
@@ -224,53 +679,31 @@ def batch_enrich_websites(companies: List[Dict[str, Any]], max_lookups: int = 50
     print(f"Batch enriching websites (max {max_lookups} lookups)...")
     print(f"{'='*60}")
     
-    lookup_count = 0
-    enriched_count = 0
+    need_website = [c for c in companies if not c.company_website and c.company_name]
+    targets = need_website[:max_lookups]
     
-    for company in companies:
-        if company.get("company_website"):
-            continue
-        
-        if lookup_count >= max_lookups:
-            remaining = sum(1 for c in companies if not c.get("company_website"))
-            print(f"  Reached max lookups. {remaining} companies still without websites.")
-            break
-        
-        company_name = company.get("company_name", "")
-        if not company_name:
-            continue
-        
-        # Rate limiting
-        if lookup_count > 0:
-            time.sleep(config.PERPLEXITY_API_DELAY)
-        
-        lookup_count += 1
-        print(f"  [{lookup_count}/{max_lookups}] Looking up: {company_name}")
-        
-        website = _find_company_website(
-            company_name,
-            company.get("industry", ""),
-            company.get("location", "")
-        )
-        
-        if website:
-            company["company_website"] = website
-            enriched_count += 1
-            print(f"    Found: {website}")
+    remaining = len(need_website) - len(targets)
+    if remaining:
+        print(f"  Reached max lookups. {remaining} companies will stay without websites.")
     
-    print(f"  Completed {lookup_count} lookups, enriched {enriched_count} companies")
+    enriched_count = await _enrich_companies(targets, concurrency)
+    
+    print(f"  Completed {len(targets)} lookups, enriched {enriched_count} companies")
     
     return companies
 
 
 if __name__ == "__main__":
     # Test the module
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logger.setLevel(logging.DEBUG)
+    
     test_companies = [
-        {"company_name": "OpenAI", "industry": "Artificial Intelligence", "location": "San Francisco, CA"},
-        {"company_name": "Stripe", "industry": "Fintech", "location": "San Francisco, CA"},
+        Company(company_name="OpenAI", industry="Artificial Intelligence", location="San Francisco, CA"),
+        Company(company_name="Stripe", industry="Fintech", location="San Francisco, CA"),
     ]
     
     enriched = enrich_with_websites(test_companies)
     for c in enriched:
-        print(f"{c['company_name']}: {c.get('company_website', 'Not found')}")
+        print(f"{c.company_name}: {c.company_website or 'Not found'}")
 
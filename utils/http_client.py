@@ -0,0 +1,283 @@
+"""
+Shared HTTP helpers for the API clients.
+Pooled sessions, retry backoff, Retry-After handling, client-side rate
+limiting and circuit breaking used by the source and sink modules.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Coroutine, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import config
+
+
+class _PacedRetry(Retry):
+    """
+    urllib3 Retry that takes a token from `rate_limiter` before each retry,
+    so retries count against the same rate limit as first attempts.
+    """
+    
+    rate_limiter: Optional["TokenBucket"] = None
+    
+    def new(self, **kw) -> "_PacedRetry":
+        # urllib3 copies the policy on every retry; carry the limiter along
+        retry = super().new(**kw)
+        retry.rate_limiter = self.rate_limiter
+        return retry
+    
+    def sleep(self, response=None) -> None:
+        super().sleep(response)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+
+def build_session(
+    pool_size: int,
+    headers: Optional[Dict[str, str]] = None,
+    rate_limiter: Optional["TokenBucket"] = None
+) -> requests.Session:
+    """
+    Create a requests.Session whose keep-alive pool matches the caller's
+    concurrency, so every worker reuses an open TCP/TLS connection.
+    
+    pool_block keeps the pool at `pool_size` connections: extra workers wait
+    for a free connection instead of opening (and discarding) new ones.
+    Connection errors and 429/5xx responses are retried by urllib3 with
+    exponential backoff (honouring Retry-After), up to MAX_RETRIES attempts
+    in all; once they run out the last response is returned for the caller
+    to inspect. Each retry takes a token from `rate_limiter`, if given.
+    """
+    session = requests.Session()
+    retries = _PacedRetry(
+        total=config.MAX_RETRIES - 1,
+        backoff_factor=config.RETRY_DELAY,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"POST"},
+        raise_on_status=False
+    )
+    retries.rate_limiter = rate_limiter
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        pool_block=True,
+        max_retries=retries
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def run_sync(coro: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Run a coroutine to completion from synchronous code.
+    
+    Uses asyncio.run() normally. If an event loop is already running in this
+    thread (e.g. a notebook), asyncio.run() would refuse, so the coroutine
+    gets its own loop on a worker thread instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """
+    Compute how long to wait before retry number `attempt` (1-based).
+    
+    Uses exponential backoff capped at MAX_DELAY with full jitter (anywhere
+    from 0 up to the cap) so that concurrent callers don't retry in lockstep.
+    A server-provided Retry-After value is honoured as the minimum wait.
+    """
+    delay = random.uniform(0, min(config.MAX_DELAY, config.BASE_DELAY * 2 ** (attempt - 1)))
+    if retry_after is not None:
+        return max(delay, retry_after)
+    return delay
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header (delta-seconds or HTTP-date) into seconds.
+    """
+    if not value:
+        return None
+    
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return (retry_at - datetime.now(timezone.utc)).total_seconds()
+
+
+class _TokenBucket:
+    """
+    Client-side token bucket shared by the sync and asyncio rate limiters.
+    
+    Tokens refill continuously at `rate` per second up to `capacity`; each
+    request consumes one. Callers wait only when the bucket is empty, so the
+    request rate stays at the configured ceiling instead of alternating
+    between bursts and fixed sleeps.
+    """
+    
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+    
+    def _refill(self) -> None:
+        """
+        Add the tokens accrued since the last update, up to capacity.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+    
+    def _try_take(self) -> float:
+        """
+        Consume a token if one is available.
+        Returns 0 on success, otherwise the seconds until the next token.
+        """
+        self._refill()
+        
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+    
+    def defer(self, seconds: float) -> None:
+        """
+        Hold off further requests for at least `seconds`, e.g. when the
+        server reports its quota is used up until a reset time.
+        """
+        self._refill()
+        self.tokens = min(self.tokens, 1 - seconds * self.rate)
+
+
+class TokenBucket(_TokenBucket):
+    """
+    Thread-safe token bucket rate limiter for blocking (requests-based) code.
+    
+    Usage:
+        with limiter:
+            session.post(...)
+    """
+    
+    def __init__(self, rate: float, capacity: float = 1.0):
+        super().__init__(rate, capacity)
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """
+        Block until a token is available and consume it.
+        """
+        while True:
+            with self._lock:
+                wait = self._try_take()
+            if not wait:
+                return
+            time.sleep(wait)
+    
+    def __enter__(self) -> "TokenBucket":
+        self.acquire()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+class AsyncTokenBucket(_TokenBucket):
+    """
+    Token bucket rate limiter for asyncio code. No lock is needed: the
+    check-and-take never yields to the event loop.
+    
+    Usage:
+        async with limiter:
+            await session.post(...)
+    """
+    
+    async def acquire(self) -> None:
+        """
+        Wait until a token is available and consume it.
+        """
+        while True:
+            wait = self._try_take()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+    
+    async def __aenter__(self) -> "AsyncTokenBucket":
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+class CircuitBreaker:
+    """
+    Stops calls to an API that keeps failing.
+    
+    After `threshold` requests in a row fail outright (retries exhausted or a
+    non-retryable error), allow_request() reports False for `cooldown`
+    seconds so callers can give up immediately. After the cool-down it is
+    half-open: exactly one caller is let through as a probe while the rest
+    keep being refused, and the probe's success closes the breaker while a
+    failure re-opens it. Meant for use from a single event loop.
+    """
+    
+    def __init__(self, name: str, threshold: int, cooldown: float):
+        self.name = name
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+    
+    def allow_request(self) -> bool:
+        if self.opened_at is None:
+            return True
+        
+        now = time.monotonic()
+        if now - self.opened_at < self.cooldown:
+            return False
+        
+        # Half-open: this caller is the probe. Restarting the window keeps
+        # everyone else out until it reports back, and lets a new probe
+        # through if it never does.
+        self.opened_at = now
+        return True
+    
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+    
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.threshold:
+            if self.opened_at is None:
+                print(f"    {self.name} circuit breaker OPEN after {self.failures} failed requests; "
+                      f"skipping {self.name} calls for {self.cooldown}s")
+            # (Re)start the cool-down; a failed probe after the window re-opens it
+            self.opened_at = time.monotonic()
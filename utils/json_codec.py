@@ -0,0 +1,114 @@
+"""
+JSON encode/decode helpers.
+Uses orjson (C-accelerated) when it is installed and falls back to the
+standard library json module otherwise. Also extracts JSON embedded in
+free-form text (LLM answers).
+"""
+
+import json
+import re
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so this covers both
+JSONDecodeError = json.JSONDecodeError
+
+# Used when pulling a JSON document out of surrounding text
+_MD_FENCE_RE = re.compile(r'^```[a-zA-Z]*\n|\n```$')
+_JSON_OPEN_RE = re.compile(r'[\[{]')
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Decode a JSON document from str or bytes.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Encode an object as compact UTF-8 JSON bytes.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def extract_json(text: str) -> Optional[Any]:
+    """
+    Extract and decode a JSON array or object from text that may contain
+    other content, such as an LLM answer with prose, a ``` fence or
+    citation markers around the data. Returns the decoded value, or None.
+    """
+    text = text.strip()
+    
+    # Remove markdown code blocks if present (```json ... ```)
+    if text.startswith("```"):
+        text = _MD_FENCE_RE.sub("", text)
+    
+    # Try direct parse, but only if the text can actually start a JSON document;
+    # prose-first answers would otherwise be tokenized in full just to fail
+    if text.lstrip()[:1] in ("[", "{"):
+        try:
+            return loads(text)
+        except JSONDecodeError:
+            pass
+    
+    # Scan for the first embedded JSON array or object, whichever opens first,
+    # so an object wrapping arrays isn't mistaken for its first inner array
+    match = _JSON_OPEN_RE.search(text)
+    while match:
+        start = match.start()
+        open_ch = text[start]
+        candidate = _find_span(text, open_ch, "]" if open_ch == "[" else "}", start)
+        if candidate is not None:
+            try:
+                data = loads(candidate)
+                # Skip citation markers like [1] that aren't records
+                if open_ch == "{" or not data or isinstance(data[0], dict):
+                    return data
+            except JSONDecodeError:
+                pass
+        match = _JSON_OPEN_RE.search(text, start + 1)
+    
+    return None
+
+
+def _find_span(text: str, open_ch: str, close_ch: str, start: int = 0) -> Optional[str]:
+    """
+    Return the first balanced open_ch...close_ch substring at or after `start`.
+    Single linear pass that ignores brackets inside JSON string literals.
+    """
+    begin = text.find(open_ch, start)
+    if begin == -1:
+        return None
+    
+    depth = 0
+    in_string = False
+    escape = False
+    
+    for i in range(begin, len(text)):
+        ch = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == open_ch:
+            depth += 1
+        elif ch == close_ch:
+            depth -= 1
+            if depth == 0:
+                return text[begin:i + 1]
+    
+    return None
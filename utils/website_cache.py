@@ -0,0 +1,169 @@
+"""
+Website lookup cache for the enrichment step.
+Keeps recent answers in an in-process LRU and persists found websites to a
+small SQLite file so reruns don't repeat Perplexity calls. Near-identical
+spellings of a cached name ("OpenAI, Inc." / "Open AI") with the same
+industry and location are matched too.
+"""
+
+import hashlib
+import sqlite3
+import time
+from collections import OrderedDict, defaultdict
+from typing import Dict, Optional, Tuple
+
+from rapidfuzz import fuzz, process
+
+import config
+from utils.company_names import company_name_key
+
+
+# Sentinel distinguishing "not cached" from a cached negative (None) answer
+MISS = object()
+
+_MEMORY_MAX_SIZE = 4096
+_memory: "OrderedDict[Tuple[str, str, str], Optional[str]]" = OrderedDict()
+
+_connection: Optional[sqlite3.Connection] = None
+
+# Found websites by (industry, location), then by compact name, for
+# near-duplicate lookups
+_by_context: Optional[Dict[Tuple[str, str], Dict[str, str]]] = None
+
+
+def get(company_name: str, industry: str = "", location: str = ""):
+    """
+    Look up a cached website.
+    Returns the URL, None for a cached "not found", or MISS.
+    """
+    key = _cache_key(company_name, industry, location)
+    
+    if key in _memory:
+        _memory.move_to_end(key)
+        return _memory[key]
+    
+    row = _db().execute(
+        "SELECT url FROM website_cache WHERE key = ? AND ts >= ?",
+        (_db_key(key), int(time.time()) - config.WEBSITE_CACHE_TTL)
+    ).fetchone()
+    if row is None:
+        return MISS
+    
+    _remember(key, row[0])
+    return row[0]
+
+
+def get_similar(company_name: str, industry: str = "", location: str = "") -> Optional[str]:
+    """
+    Find a cached website for a near-identical company name, if any.
+    Only names cached with the same industry and location are compared;
+    a match must score at least WEBSITE_CACHE_MATCH_THRESHOLD.
+    """
+    name = company_name_key(company_name)
+    if not name:
+        return None
+    
+    by_name = _names().get(_context_key(industry, location))
+    if not by_name:
+        return None
+    if name in by_name:
+        return by_name[name]
+    
+    match = process.extractOne(
+        name,
+        by_name.keys(),
+        scorer=fuzz.ratio,
+        score_cutoff=config.WEBSITE_CACHE_MATCH_THRESHOLD
+    )
+    return by_name[match[0]] if match else None
+
+
+def put(company_name: str, industry: str, location: str, url: Optional[str]) -> None:
+    """
+    Cache a lookup result. Negative answers are only kept in memory, so a
+    company whose site wasn't found is retried on the next run.
+    """
+    key = _cache_key(company_name, industry, location)
+    _remember(key, url)
+    
+    if url:
+        name = company_name_key(company_name)
+        context = _context_key(industry, location)
+        if name:
+            _names()[context][name] = url
+        
+        db = _db()
+        db.execute(
+            "INSERT OR REPLACE INTO website_cache (key, name, industry, location, url, ts) VALUES (?, ?, ?, ?, ?, ?)",
+            (_db_key(key), name, context[0], context[1], url, int(time.time()))
+        )
+        db.commit()
+
+
+def _cache_key(company_name: str, industry: str, location: str) -> Tuple[str, str, str]:
+    """
+    Exact cache key. News records often carry None for industry/location.
+    """
+    return company_name or "", industry or "", location or ""
+
+
+def _remember(key: Tuple[str, str, str], url: Optional[str]) -> None:
+    """
+    Store a result in the in-process LRU, evicting the oldest entry when full.
+    """
+    _memory[key] = url
+    _memory.move_to_end(key)
+    if len(_memory) > _MEMORY_MAX_SIZE:
+        _memory.popitem(last=False)
+
+
+def _context_key(industry: str, location: str) -> Tuple[str, str]:
+    """
+    Industry and location as compared by get_similar().
+    """
+    return (industry or "").strip().lower(), (location or "").strip().lower()
+
+
+def _names() -> Dict[Tuple[str, str], Dict[str, str]]:
+    """
+    Name index of unexpired found websites, loaded from disk on first use.
+    """
+    global _by_context
+    if _by_context is None:
+        rows = _db().execute(
+            "SELECT industry, location, name, url FROM website_cache WHERE name != '' AND ts >= ?",
+            (int(time.time()) - config.WEBSITE_CACHE_TTL,)
+        )
+        _by_context = defaultdict(dict)
+        for industry, location, name, url in rows:
+            _by_context[(industry, location)][name] = url
+    return _by_context
+
+
+def _db_key(key: Tuple[str, str, str]) -> str:
+    """
+    Stable key for the persistent cache.
+    """
+    return hashlib.sha1("|".join(key).encode("utf-8")).hexdigest()
+
+
+def _db() -> sqlite3.Connection:
+    """
+    Open the persistent cache on first use.
+    """
+    global _connection
+    if _connection is None:
+        _connection = sqlite3.connect(config.WEBSITE_CACHE_PATH, check_same_thread=False)
+        
+        # Caches written before industry/location were stored can't serve
+        # similar-name lookups, so they are dropped rather than migrated
+        columns = {row[1] for row in _connection.execute("PRAGMA table_info(website_cache)")}
+        if columns and "industry" not in columns:
+            _connection.execute("DROP TABLE website_cache")
+        
+        _connection.execute(
+            "CREATE TABLE IF NOT EXISTS website_cache "
+            "(key TEXT PRIMARY KEY, name TEXT, industry TEXT, location TEXT, url TEXT, ts INTEGER)"
+        )
+        _connection.commit()
+    return _connection